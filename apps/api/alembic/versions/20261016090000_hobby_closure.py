@@ -0,0 +1,56 @@
+"""hobby closure table for subtree filtering
+
+Revision ID: hobby_closure
+Revises: 5011b8fb9219
+Create Date: 2026-10-16 09:00:00
+"""
+
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "hobby_closure"
+down_revision = "5011b8fb9219"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    conn.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS hobby_closure (
+            ancestor_id INTEGER NOT NULL REFERENCES hobby(id) ON DELETE CASCADE,
+            descendant_id INTEGER NOT NULL REFERENCES hobby(id) ON DELETE CASCADE,
+            depth INTEGER NOT NULL,
+            PRIMARY KEY (ancestor_id, descendant_id)
+        );
+        """
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_hobby_closure_descendant "
+        "ON hobby_closure(descendant_id);"
+    )
+
+    # Populate from the existing parent_id tree; triggers that keep it
+    # current are created on startup by app.db.closure.ensure_hobby_closure
+    conn.exec_driver_sql(
+        """
+        INSERT INTO hobby_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM hobby
+            UNION ALL
+            SELECT tree.ancestor_id, hobby.id, tree.depth + 1
+            FROM tree JOIN hobby ON hobby.parent_id = tree.descendant_id
+        )
+        SELECT ancestor_id, descendant_id, depth FROM tree;
+        """
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.exec_driver_sql("DROP TRIGGER IF EXISTS hobby_closure_ai;")
+    conn.exec_driver_sql("DROP TRIGGER IF EXISTS hobby_closure_au;")
+    conn.exec_driver_sql("DROP TRIGGER IF EXISTS hobby_closure_ad;")
+    conn.exec_driver_sql("DROP TABLE IF EXISTS hobby_closure;")
@@ -0,0 +1,62 @@
+"""entry summary read model for list cards
+
+Revision ID: entry_summary
+Revises: hobby_closure
+Create Date: 2026-10-16 10:00:00
+"""
+
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "entry_summary"
+down_revision = "hobby_closure"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    conn.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS entry_summary (
+            entry_id INTEGER PRIMARY KEY REFERENCES entry(id) ON DELETE CASCADE,
+            media_count INTEGER NOT NULL DEFAULT 0,
+            cover_path VARCHAR(500),
+            props_json TEXT NOT NULL DEFAULT '{}'
+        );
+        """
+    )
+
+    # Populate from existing media and props; triggers that keep it current
+    # are created on startup by app.db.fts.ensure_entry_summary
+    conn.exec_driver_sql(
+        """
+        INSERT OR REPLACE INTO entry_summary (
+            entry_id, media_count, cover_path, props_json
+        )
+        SELECT e.id,
+            (SELECT COUNT(*) FROM entrymedia m WHERE m.entry_id = e.id),
+            (SELECT m.file_path FROM entrymedia m
+             WHERE m.entry_id = e.id AND m.kind = 'image' ORDER BY m.id LIMIT 1),
+            (SELECT json_group_object(p.key, p.value_text) FROM entryprop p
+             WHERE p.entry_id = e.id)
+        FROM entry AS e;
+        """
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for trigger in (
+        "entry_summary_ai",
+        "entry_summary_ad",
+        "entrymedia_summary_ai",
+        "entrymedia_summary_ad",
+        "entrymedia_summary_au",
+        "entryprop_summary_ai",
+        "entryprop_summary_ad",
+        "entryprop_summary_au",
+    ):
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger};")
+    conn.exec_driver_sql("DROP TABLE IF EXISTS entry_summary;")
@@ -0,0 +1,63 @@
+"""precomputed description excerpt in entry_summary
+
+Revision ID: entry_summary_excerpt
+Revises: entry_summary
+Create Date: 2026-10-17 09:00:00
+"""
+
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "entry_summary_excerpt"
+down_revision = "entry_summary"
+branch_labels = None
+depends_on = None
+
+SUMMARY_TRIGGERS = (
+    "entry_summary_ai",
+    "entry_summary_ad",
+    "entry_summary_au",
+    "entrymedia_summary_ai",
+    "entrymedia_summary_ad",
+    "entrymedia_summary_au",
+    "entryprop_summary_ai",
+    "entryprop_summary_ad",
+    "entryprop_summary_au",
+)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # Existing triggers do not write the excerpt; app.db.fts.ensure_entry_summary
+    # recreates them on startup
+    for trigger in SUMMARY_TRIGGERS:
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger};")
+    columns = {
+        row[1] for row in conn.exec_driver_sql("PRAGMA table_info(entry_summary)")
+    }
+    if "excerpt" not in columns:
+        conn.exec_driver_sql("ALTER TABLE entry_summary ADD COLUMN excerpt TEXT;")
+
+    conn.exec_driver_sql(
+        """
+        UPDATE entry_summary SET excerpt = (
+            SELECT CASE WHEN length(e.description) > 160
+                THEN rtrim(substr(
+                    replace(replace(e.description, char(13), ''), char(10), ' '),
+                    1, 160
+                )) || '…'
+                ELSE replace(replace(e.description, char(13), ''), char(10), ' ')
+            END
+            FROM entry AS e WHERE e.id = entry_summary.entry_id
+        );
+        """
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    # Triggers writing the excerpt column go with it
+    for trigger in SUMMARY_TRIGGERS:
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger};")
+    conn.exec_driver_sql("ALTER TABLE entry_summary DROP COLUMN excerpt;")
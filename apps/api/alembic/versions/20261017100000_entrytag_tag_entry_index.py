@@ -0,0 +1,30 @@
+"""composite (tag, entry_id) index on entrytag
+
+Revision ID: entrytag_tag_entry
+Revises: entry_summary_excerpt
+Create Date: 2026-10-17 10:00:00
+"""
+
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "entrytag_tag_entry"
+down_revision = "entry_summary_excerpt"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # The composite index serves every lookup the tag-only index did
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_entrytag_tag_entry ON entrytag(tag, entry_id);"
+    )
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_entrytag_tag;")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_entrytag_tag ON entrytag(tag);")
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_entrytag_tag_entry;")
@@ -0,0 +1,72 @@
+"""typed numeric index on entryprop
+
+Revision ID: entryprop_value_num
+Revises: entrytag_tag_entry
+Create Date: 2026-10-17 11:00:00
+"""
+
+import json
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "entryprop_value_num"
+down_revision = "entrytag_tag_entry"
+branch_labels = None
+depends_on = None
+
+NUMERIC_TYPES = {"number", "integer", "boolean"}
+
+
+def _numeric_keys(schema_json: str | None) -> list[str]:
+    try:
+        properties = json.loads(schema_json or "{}").get("properties") or {}
+    except (ValueError, AttributeError):
+        return []
+    keys = []
+    for key, definition in properties.items():
+        types = definition.get("type") if isinstance(definition, dict) else None
+        if isinstance(types, str):
+            types = [types]
+        if isinstance(types, list) and NUMERIC_TYPES.intersection(types):
+            keys.append(key)
+    return keys
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(entryprop)")}
+    if "value_num" not in columns:
+        conn.exec_driver_sql("ALTER TABLE entryprop ADD COLUMN value_num FLOAT;")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_entryprop_key_num "
+        "ON entryprop(key, value_num, entry_id);"
+    )
+
+    # Backfill from each hobby type's schema, as the API does on write
+    backfill = sa.text(
+        """
+        UPDATE entryprop SET value_num = CASE
+            WHEN NOT json_valid(value_text) THEN NULL
+            WHEN json_type(value_text) IN ('integer', 'real')
+                THEN CAST(value_text AS REAL)
+            WHEN json_type(value_text) = 'true' THEN 1.0
+            WHEN json_type(value_text) = 'false' THEN 0.0
+        END
+        WHERE key IN :keys
+          AND entry_id IN (SELECT id FROM entry WHERE type_key = :type_key)
+        """
+    ).bindparams(sa.bindparam("keys", expanding=True))
+    types = conn.exec_driver_sql("SELECT key, schema_json FROM hobbytype").all()
+    for type_key, schema_json in types:
+        keys = _numeric_keys(schema_json)
+        if keys:
+            conn.execute(backfill, {"keys": keys, "type_key": type_key})
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_entryprop_key_num;")
+    conn.exec_driver_sql("ALTER TABLE entryprop DROP COLUMN value_num;")
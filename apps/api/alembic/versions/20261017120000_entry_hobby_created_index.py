@@ -0,0 +1,33 @@
+"""composite (hobby_id, created_at) index on entry
+
+Revision ID: entry_hobby_created
+Revises: entryprop_value_num
+Create Date: 2026-10-17 12:00:00
+"""
+
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "entry_hobby_created"
+down_revision = "entryprop_value_num"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # The composite index serves every lookup the hobby-only index did
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_entry_hobby_created "
+        "ON entry(hobby_id, created_at);"
+    )
+    conn.exec_driver_sql("DROP INDEX IF EXISTS idx_entry_hobby;")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS idx_entry_hobby ON entry(hobby_id);"
+    )
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_entry_hobby_created;")
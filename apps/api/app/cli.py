@@ -3,15 +3,28 @@ import os
 import random
 
 import typer
+from sqlalchemy.exc import DatabaseError
 from sqlalchemy.orm import Session
 
 from .auth import hash_password
-from .db.fts import ensure_fts
+from .db.closure import ensure_hobby_closure
+from .db.fts import (
+    FTS_TABLES,
+    ensure_entry_summary,
+    ensure_fts,
+    existing_fts_tables,
+    fts_stats,
+    rebuild_entry_summary,
+    run_fts_command,
+)
 from .db.session import SessionLocal
 from .models import Entry, EntryProp, Hobby, HobbyType, User
 from .services.hobby_tree import ensure_unique_slug, slugify
+from .services.prop_index import numeric_prop_keys, prop_value_num
 
 app = typer.Typer(name="hobby-showcase")
+fts_app = typer.Typer(help="Maintain the full-text search indexes")
+app.add_typer(fts_app, name="fts")
 
 SEED_HOBBY_TYPES = [
     {
@@ -123,8 +136,10 @@ def init():
     session = get_db_session()
 
     try:
-        # Ensure FTS5 setup
+        # Ensure FTS5, entry summary and hobby closure setup
         ensure_fts(session)
+        ensure_entry_summary(session)
+        ensure_hobby_closure(session)
 
         # Create default user if none exists
         existing_user = session.query(User).first()
@@ -219,6 +234,106 @@ def create_user(
 
 
 
+@app.command()
+def rebuild_summary():
+    """Recompute the entry_summary read model from media and props"""
+    session = get_db_session()
+
+    try:
+        ensure_entry_summary(session)
+        rows = rebuild_entry_summary(session)
+        session.commit()
+        typer.echo(f"Rebuilt entry summary for {rows} entries.")
+
+    except Exception as e:
+        session.rollback()
+        typer.echo(f"Error rebuilding entry summary: {e}")
+        raise
+    finally:
+        session.close()
+
+
+def _fts_targets(session: Session, table: str | None) -> list[str]:
+    if table and table not in FTS_TABLES:
+        raise typer.BadParameter(f"expected one of {', '.join(FTS_TABLES)}")
+    existing = existing_fts_tables(session)
+    return [t for t in existing if t == table] if table else existing
+
+
+def _run_fts_command(command: str, table: str | None) -> None:
+    session = get_db_session()
+
+    try:
+        for name in _fts_targets(session, table):
+            before = fts_stats(session, name)
+            run_fts_command(session, name, command)
+            session.commit()
+            after = fts_stats(session, name)
+            typer.echo(
+                f"{name}: {command} done "
+                f"(segments {before['segments']} -> {after['segments']})"
+            )
+
+    except Exception as e:
+        session.rollback()
+        typer.echo(f"Error running FTS {command}: {e}")
+        raise
+    finally:
+        session.close()
+
+
+TABLE_OPTION = typer.Option(None, "--table", help="Only this FTS table")
+
+
+@fts_app.command()
+def rebuild(table: str | None = TABLE_OPTION):
+    """Rebuild FTS indexes from their content tables (e.g. after bulk loads)"""
+    _run_fts_command("rebuild", table)
+
+
+@fts_app.command()
+def optimize(table: str | None = TABLE_OPTION):
+    """Merge FTS index segments fragmented by incremental writes"""
+    _run_fts_command("optimize", table)
+
+
+@fts_app.command("integrity-check")
+def integrity_check(table: str | None = TABLE_OPTION):
+    """Verify FTS indexes against their content tables"""
+    session = get_db_session()
+
+    try:
+        failed = False
+        for name in _fts_targets(session, table):
+            try:
+                run_fts_command(session, name, "integrity-check")
+                typer.echo(f"{name}: ok")
+            except DatabaseError as e:
+                failed = True
+                typer.echo(f"{name}: {e.orig}")
+            session.rollback()
+        if failed:
+            raise typer.Exit(code=1)
+    finally:
+        session.close()
+
+
+@fts_app.command()
+def stats(table: str | None = TABLE_OPTION):
+    """Show row, level and segment counts and index size per FTS table"""
+    session = get_db_session()
+
+    try:
+        for name in _fts_targets(session, table):
+            s = fts_stats(session, name)
+            typer.echo(
+                f"{name}: {s['rows']} rows, {s['levels']} levels, "
+                f"{s['segments']} segments, {s['blocks']} blocks, "
+                f"{s['index_bytes']} bytes"
+            )
+    finally:
+        session.close()
+
 
 @app.command()
 def starter(
@@ -253,6 +368,7 @@ def starter(
             prop_defs = schema.get("properties", {})
         except Exception:
             prop_defs = {}
+        numeric_keys = numeric_prop_keys(t.schema_json)
 
         lenses = ["50mm", "35mm", "85mm", "24-70mm", "70-200mm"]
         shutt = ["1/100", "1/250", "1/500", "1/60"]
@@ -289,7 +405,10 @@ def starter(
                 else:
                     v = random.choice(["auto", "manual", "custom"])
 
-                props.append(EntryProp(entry_id=e.id, key=key, value_text=v))
+                value_num = prop_value_num(v) if key in numeric_keys else None
+                props.append(
+                    EntryProp(entry_id=e.id, key=key, value_text=v, value_num=value_num)
+                )
 
             session.add_all(props)
 
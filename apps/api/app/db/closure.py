@@ -0,0 +1,84 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+REBUILD_CLOSURE_SQL = """
+    INSERT INTO hobby_closure (ancestor_id, descendant_id, depth)
+    WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+        SELECT id, id, 0 FROM hobby
+        UNION ALL
+        SELECT tree.ancestor_id, hobby.id, tree.depth + 1
+        FROM tree JOIN hobby ON hobby.parent_id = tree.descendant_id
+    )
+    SELECT ancestor_id, descendant_id, depth FROM tree
+"""
+
+
+def rebuild_hobby_closure(session: Session) -> None:
+    """Recompute hobby_closure from hobby.parent_id"""
+    session.execute(text("DELETE FROM hobby_closure"))
+    session.execute(text(REBUILD_CLOSURE_SQL))
+
+
+def ensure_hobby_closure(session: Session) -> None:
+    """Ensure hobby_closure triggers exist and the table is populated"""
+    session.execute(text("""
+        CREATE TABLE IF NOT EXISTS hobby_closure (
+            ancestor_id INTEGER NOT NULL REFERENCES hobby(id) ON DELETE CASCADE,
+            descendant_id INTEGER NOT NULL REFERENCES hobby(id) ON DELETE CASCADE,
+            depth INTEGER NOT NULL,
+            PRIMARY KEY (ancestor_id, descendant_id)
+        )
+    """))
+    session.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_hobby_closure_descendant
+        ON hobby_closure(descendant_id)
+    """))
+
+    # New hobby: self row plus one row per ancestor of its parent
+    session.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS hobby_closure_ai AFTER INSERT ON hobby BEGIN
+            INSERT INTO hobby_closure(ancestor_id, descendant_id, depth)
+            SELECT new.id, new.id, 0
+            UNION ALL
+            SELECT ancestor_id, new.id, depth + 1
+            FROM hobby_closure WHERE descendant_id = new.parent_id;
+        END
+    """))
+
+    # Reparent: detach the subtree from its old ancestors, then attach it
+    # below every ancestor of the new parent
+    session.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS hobby_closure_au AFTER UPDATE OF parent_id ON hobby
+        WHEN old.parent_id IS NOT new.parent_id BEGIN
+            DELETE FROM hobby_closure
+            WHERE descendant_id IN (
+                SELECT descendant_id FROM hobby_closure WHERE ancestor_id = new.id
+            )
+            AND ancestor_id NOT IN (
+                SELECT descendant_id FROM hobby_closure WHERE ancestor_id = new.id
+            );
+            INSERT INTO hobby_closure(ancestor_id, descendant_id, depth)
+            SELECT sup.ancestor_id, sub.descendant_id, sup.depth + sub.depth + 1
+            FROM hobby_closure AS sup, hobby_closure AS sub
+            WHERE sup.descendant_id = new.parent_id AND sub.ancestor_id = new.id;
+        END
+    """))
+
+    session.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS hobby_closure_ad AFTER DELETE ON hobby BEGIN
+            DELETE FROM hobby_closure
+            WHERE descendant_id = old.id OR ancestor_id = old.id;
+        END
+    """))
+
+    # Backfill databases whose hobbies predate the closure table
+    missing = session.execute(text("""
+        SELECT EXISTS (
+            SELECT 1 FROM hobby
+            WHERE id NOT IN (SELECT descendant_id FROM hobby_closure WHERE depth = 0)
+        )
+    """)).scalar()
+    if missing:
+        rebuild_hobby_closure(session)
+
+    session.commit()
@@ -1,38 +1,396 @@
-from sqlalchemy import text
+import sqlite3
+
+from sqlalchemy import bindparam, text
 from sqlalchemy.orm import Session
 
+FTS_COLUMNS = ("title", "description", "tags", "props")
+
+# The trigram tokenizer ships with SQLite 3.34+; without it substring
+# search is unavailable and entry_trigram is not created
+TRIGRAM_SUPPORTED = sqlite3.sqlite_version_info >= (3, 34, 0)
+TRIGRAM_COLUMNS = ("title", "description", "tags")
+
+# Index a row from the content view, or remove it using the values it was
+# indexed with. The view always reflects the current state, so removals run
+# in BEFORE triggers and re-inserts in AFTER triggers.
+_FTS_INSERT_SQL = """
+    INSERT INTO entry_fts(rowid, title, description, tags, props)
+    SELECT id, title, description, tags, props FROM entry_fts_content
+    WHERE id IN ({ids});
+"""
+_FTS_DELETE_SQL = """
+    INSERT INTO entry_fts(entry_fts, rowid, title, description, tags, props)
+    SELECT 'delete', id, title, description, tags, props FROM entry_fts_content
+    WHERE id IN ({ids});
+"""
+
+
+# Options that older entry_fts definitions lack; a table missing any of
+# them is dropped and rebuilt by ensure_fts
+_FTS_REQUIRED_OPTIONS = ("props", "prefix=")
+
+
+def _fts_is_current(session: Session) -> bool:
+    sql = session.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'entry_fts'"
+    )).scalar()
+    return sql is None or all(option in sql for option in _FTS_REQUIRED_OPTIONS)
+
 
 def ensure_fts(session: Session) -> None:
-    """Ensure FTS5 virtual table and triggers exist for Entry search"""
+    """Ensure FTS5 virtual table and triggers exist for Entry search
+
+    Indexes entry title, description and tags plus the values of its
+    props, through the ``entry_fts_content`` view. Two- and three-character
+    prefix indexes and the ``entry_fts_vocab`` table back autocomplete.
+    Where SQLite supports it, ``entry_trigram`` backs substring search.
+    """
+    # Triggers from the title/description/tags-only index
+    for trigger in ("entry_ai", "entry_ad", "entry_au"):
+        session.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    if not _fts_is_current(session):
+        session.execute(text("DROP TABLE IF EXISTS entry_fts_vocab"))
+        session.execute(text("DROP TABLE entry_fts"))
+
+    # Content view: one row per entry with prop values joined in id order
+    session.execute(text("""
+        CREATE VIEW IF NOT EXISTS entry_fts_content AS
+        SELECT e.id, e.title, e.description, e.tags,
+            (SELECT group_concat(value_text, ' ') FROM (
+                SELECT p.value_text FROM entryprop p
+                WHERE p.entry_id = e.id ORDER BY p.id
+            )) AS props
+        FROM entry AS e
+    """))
+
     # Create FTS5 virtual table
+    created = not session.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'entry_fts'"
+    )).first()
     session.execute(text("""
         CREATE VIRTUAL TABLE IF NOT EXISTS entry_fts USING fts5(
-            title, description, tags, content='entry', content_rowid='id'
+            title, description, tags, props,
+            content='entry_fts_content', content_rowid='id',
+            prefix='2 3'
         )
     """))
+    if created:
+        session.execute(text("INSERT INTO entry_fts(entry_fts) VALUES ('rebuild')"))
+
+    # Per-term document counts for prefix completion
+    session.execute(text("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS entry_fts_vocab
+        USING fts5vocab(entry_fts, row)
+    """))
 
     # Create triggers for automatic indexing
+    session.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS entry_fts_ai AFTER INSERT ON entry BEGIN
+            {_FTS_INSERT_SQL.format(ids="new.id")}
+        END
+    """))
+
+    session.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS entry_fts_bd BEFORE DELETE ON entry BEGIN
+            {_FTS_DELETE_SQL.format(ids="old.id")}
+        END
+    """))
+
+    session.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS entry_fts_bu
+        BEFORE UPDATE OF title, description, tags ON entry BEGIN
+            {_FTS_DELETE_SQL.format(ids="old.id")}
+        END
+    """))
+    session.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS entry_fts_au
+        AFTER UPDATE OF title, description, tags ON entry BEGIN
+            {_FTS_INSERT_SQL.format(ids="new.id")}
+        END
+    """))
+
+    # Prop writes re-index the owning entry. An upsert that hits an
+    # existing (entry_id, key) fires BEFORE INSERT and then the UPDATE
+    # triggers, so the insert-side delete is skipped when the row exists;
+    # deleting a document twice corrupts an external-content index.
+    # Recreated every time so databases with the unguarded trigger pick
+    # the guard up
+    session.execute(text("DROP TRIGGER IF EXISTS entryprop_fts_bi"))
+    upsert_guard = """
+        WHEN NOT EXISTS (
+            SELECT 1 FROM entryprop WHERE entry_id = new.entry_id AND key = new.key
+        )
+    """
+    for event, ids, guard in (
+        ("INSERT", "new.entry_id", upsert_guard),
+        ("DELETE", "old.entry_id", ""),
+        ("UPDATE", "old.entry_id, new.entry_id", ""),
+    ):
+        suffix = event[0].lower()
+        session.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS entryprop_fts_b{suffix}
+            BEFORE {event} ON entryprop {guard} BEGIN
+                {_FTS_DELETE_SQL.format(ids=ids)}
+            END
+        """))
+        session.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS entryprop_fts_a{suffix}
+            AFTER {event} ON entryprop BEGIN
+                {_FTS_INSERT_SQL.format(ids=ids)}
+            END
+        """))
+
+    if TRIGRAM_SUPPORTED:
+        _ensure_trigram(session)
+
+    session.commit()
+
+
+def _ensure_trigram(session: Session) -> None:
+    """Create the trigram index over entry title, description and tags
+
+    Backs substring search for fragments the unicode61 tokenizer splits
+    apart, such as model numbers, ISBNs and URLs.
+    """
+    created = not session.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'entry_trigram'"
+    )).first()
     session.execute(text("""
-        CREATE TRIGGER IF NOT EXISTS entry_ai AFTER INSERT ON entry BEGIN
-            INSERT INTO entry_fts(rowid, title, description, tags)
+        CREATE VIRTUAL TABLE IF NOT EXISTS entry_trigram USING fts5(
+            title, description, tags,
+            content='entry', content_rowid='id',
+            tokenize='trigram'
+        )
+    """))
+    if created:
+        session.execute(text(
+            "INSERT INTO entry_trigram(entry_trigram) VALUES ('rebuild')"
+        ))
+
+    session.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS entry_trigram_ai AFTER INSERT ON entry BEGIN
+            INSERT INTO entry_trigram(rowid, title, description, tags)
             VALUES (new.id, new.title, new.description, new.tags);
         END
     """))
-
     session.execute(text("""
-        CREATE TRIGGER IF NOT EXISTS entry_ad AFTER DELETE ON entry BEGIN
-            INSERT INTO entry_fts(entry_fts, rowid, title, description, tags)
+        CREATE TRIGGER IF NOT EXISTS entry_trigram_ad AFTER DELETE ON entry BEGIN
+            INSERT INTO entry_trigram(entry_trigram, rowid, title, description, tags)
             VALUES ('delete', old.id, old.title, old.description, old.tags);
         END
     """))
-
     session.execute(text("""
-        CREATE TRIGGER IF NOT EXISTS entry_au AFTER UPDATE ON entry BEGIN
-            INSERT INTO entry_fts(entry_fts, rowid, title, description, tags)
+        CREATE TRIGGER IF NOT EXISTS entry_trigram_au
+        AFTER UPDATE OF title, description, tags ON entry BEGIN
+            INSERT INTO entry_trigram(entry_trigram, rowid, title, description, tags)
             VALUES ('delete', old.id, old.title, old.description, old.tags);
-            INSERT INTO entry_fts(rowid, title, description, tags)
+            INSERT INTO entry_trigram(rowid, title, description, tags)
             VALUES (new.id, new.title, new.description, new.tags);
         END
     """))
 
+
+# FTS5 tables maintained by ensure_fts, in the order maintenance runs
+FTS_TABLES = ("entry_fts", "entry_trigram")
+
+# Row id of the structure record in an FTS5 %_data table
+_FTS_STRUCTURE_ROWID = 10
+_FTS_STRUCTURE_V2 = b"\xff\x00\x00\x01"
+
+
+def existing_fts_tables(session: Session) -> list[str]:
+    """Return the FTS_TABLES present in this database"""
+    rows = session.execute(
+        text(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN :names"
+        ).bindparams(bindparam("names", expanding=True)),
+        {"names": list(FTS_TABLES)},
+    ).scalars().all()
+    return [t for t in FTS_TABLES if t in rows]
+
+
+def run_fts_command(session: Session, table: str, command: str) -> None:
+    """Run an FTS5 special insert command such as 'rebuild' or 'optimize'
+
+    'integrity-check' also compares the index against the content table
+    and raises ``DatabaseError`` if they disagree.
+    """
+    if table not in FTS_TABLES:
+        raise ValueError(f"Unknown FTS table: {table}")
+    if command == "integrity-check":
+        # table is one of FTS_TABLES, checked above
+        session.execute(text(
+            f"INSERT INTO {table}({table}, rank) VALUES ('integrity-check', 1)"  # noqa: S608
+        ))
+    else:
+        session.execute(
+            text(f"INSERT INTO {table}({table}) VALUES (:command)"),  # noqa: S608
+            {"command": command},
+        )
+
+
+def _read_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    """Decode an SQLite varint at ``pos``, returning ``(value, next_pos)``"""
+    value = 0
+    for i in range(8):
+        byte = buf[pos + i]
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value, pos + i + 1
+    return (value << 8) | buf[pos + 8], pos + 9
+
+
+def fts_stats(session: Session, table: str) -> dict[str, int]:
+    """Report row, level and segment counts plus index size for an FTS table
+
+    Levels and segments come from the header of the FTS5 structure record;
+    many segments mean trigger-driven writes have fragmented the index and
+    an 'optimize' will merge them. Index size is the total of the
+    ``%_data`` blocks, which hold the whole inverted index.
+    """
+    if table not in FTS_TABLES:
+        raise ValueError(f"Unknown FTS table: {table}")
+    # Shadow table names below derive from a checked FTS_TABLES name
+    structure = session.execute(
+        text(f"SELECT block FROM {table}_data WHERE id = :id"),  # noqa: S608
+        {"id": _FTS_STRUCTURE_ROWID},
+    ).scalar()
+    levels = segments = 0
+    if structure:
+        pos = 8 if structure[4:8] == _FTS_STRUCTURE_V2 else 4
+        levels, pos = _read_varint(structure, pos)
+        segments, pos = _read_varint(structure, pos)
+    blocks, data_bytes = session.execute(text(
+        f"SELECT COUNT(*), COALESCE(SUM(length(block)), 0) FROM {table}_data"  # noqa: S608
+    )).one()
+    rows = session.execute(
+        text(f"SELECT COUNT(*) FROM {table}_docsize")  # noqa: S608
+    ).scalar()
+    return {
+        "rows": int(rows or 0),
+        "levels": levels,
+        "segments": segments,
+        "blocks": int(blocks),
+        "index_bytes": int(data_bytes),
+    }
+
+
+# Length of the single-line description excerpt kept in entry_summary
+EXCERPT_LENGTH = 160
+
+_EXCERPT_SQL = f"""
+    CASE WHEN length(e.description) > {EXCERPT_LENGTH}
+        THEN rtrim(substr(
+            replace(replace(e.description, char(13), ''), char(10), ' '),
+            1, {EXCERPT_LENGTH}
+        )) || '…'
+        ELSE replace(replace(e.description, char(13), ''), char(10), ' ')
+    END
+"""
+
+# Recompute one entry's summary row; skipped when the entry itself is gone
+# (e.g. child rows removed by ON DELETE CASCADE after the entry delete).
+# Only the module constants above and fixed WHERE clauses are interpolated.
+_REFRESH_SUMMARY_SQL = f"""
+    INSERT INTO entry_summary (
+        entry_id, media_count, cover_path, props_json, excerpt
+    )
+    SELECT e.id,
+        (SELECT COUNT(*) FROM entrymedia m WHERE m.entry_id = e.id),
+        (SELECT m.file_path FROM entrymedia m
+         WHERE m.entry_id = e.id AND m.kind = 'image' ORDER BY m.id LIMIT 1),
+        (SELECT json_group_object(p.key, p.value_text) FROM entryprop p
+         WHERE p.entry_id = e.id),
+        {_EXCERPT_SQL}
+    FROM entry AS e
+    WHERE {{where}}
+    ON CONFLICT(entry_id) DO UPDATE SET
+        media_count = excluded.media_count,
+        cover_path = excluded.cover_path,
+        props_json = excluded.props_json,
+        excerpt = excluded.excerpt;
+"""  # noqa: S608
+
+_SUMMARY_TRIGGERS = (
+    "entry_summary_ai", "entry_summary_ad", "entry_summary_au",
+    "entrymedia_summary_ai", "entrymedia_summary_ad", "entrymedia_summary_au",
+    "entryprop_summary_ai", "entryprop_summary_ad", "entryprop_summary_au",
+)
+
+
+def rebuild_entry_summary(session: Session) -> int:
+    """Recompute entry_summary for every entry, returning the row count"""
+    session.execute(text("DELETE FROM entry_summary"))
+    session.execute(text(_REFRESH_SUMMARY_SQL.format(where="1")))
+    count = session.execute(text("SELECT COUNT(*) FROM entry_summary")).scalar()
+    return int(count or 0)
+
+
+def ensure_entry_summary(session: Session) -> None:
+    """Ensure the entry_summary read model and its triggers exist"""
+    session.execute(text("""
+        CREATE TABLE IF NOT EXISTS entry_summary (
+            entry_id INTEGER PRIMARY KEY REFERENCES entry(id) ON DELETE CASCADE,
+            media_count INTEGER NOT NULL DEFAULT 0,
+            cover_path VARCHAR(500),
+            props_json TEXT NOT NULL DEFAULT '{}',
+            excerpt TEXT
+        )
+    """))
+
+    # Tables created before the excerpt column get it added and backfilled;
+    # their triggers predate it and are recreated below
+    columns = {
+        row[1] for row in session.execute(text("PRAGMA table_info(entry_summary)"))
+    }
+    if "excerpt" not in columns:
+        for trigger in _SUMMARY_TRIGGERS:
+            session.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        session.execute(text("ALTER TABLE entry_summary ADD COLUMN excerpt TEXT"))
+        session.execute(text(_REFRESH_SUMMARY_SQL.format(where="1")))
+
+    session.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS entry_summary_ai AFTER INSERT ON entry BEGIN
+            {_REFRESH_SUMMARY_SQL.format(where="e.id = new.id")}
+        END
+    """))
+    session.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS entry_summary_au
+        AFTER UPDATE OF description ON entry BEGIN
+            {_REFRESH_SUMMARY_SQL.format(where="e.id = new.id")}
+        END
+    """))
+    session.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS entry_summary_ad AFTER DELETE ON entry BEGIN
+            DELETE FROM entry_summary WHERE entry_id = old.id;
+        END
+    """))
+
+    for table in ("entrymedia", "entryprop"):
+        session.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_summary_ai
+            AFTER INSERT ON {table} BEGIN
+                {_REFRESH_SUMMARY_SQL.format(where="e.id = new.entry_id")}
+            END
+        """))
+        session.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_summary_ad
+            AFTER DELETE ON {table} BEGIN
+                {_REFRESH_SUMMARY_SQL.format(where="e.id = old.entry_id")}
+            END
+        """))
+        session.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_summary_au
+            AFTER UPDATE ON {table} BEGIN
+                {_REFRESH_SUMMARY_SQL.format(
+                    where="e.id IN (old.entry_id, new.entry_id)"
+                )}
+            END
+        """))
+
+    # Backfill entries written before the triggers existed
+    session.execute(text(_REFRESH_SUMMARY_SQL.format(
+        where="e.id NOT IN (SELECT entry_id FROM entry_summary)"
+    )))
+
     session.commit()
@@ -9,7 +9,8 @@ from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import ValidationError
 
-from .db.fts import ensure_fts
+from .db.closure import ensure_hobby_closure
+from .db.fts import ensure_entry_summary, ensure_fts
 from .db.session import SessionLocal
 from .routers import (
     auth_router,
@@ -18,18 +19,22 @@ from .routers import (
     hobbies_router,
     hobby_types_router,
     search_router,
+    tags_router,
     users_router,
 )
+from .services.response_cache import response_cache
 from .services.uploads import _resolve_upload_dir
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan events for FastAPI application"""
-    # Startup - initialize FTS5 tables and triggers
+    # Startup - initialize FTS5, summary and hobby closure tables and triggers
     session = SessionLocal()
     try:
         ensure_fts(session)
+        ensure_entry_summary(session)
+        ensure_hobby_closure(session)
     finally:
         session.close()
     yield
@@ -117,6 +122,7 @@ app.include_router(hobbies_router, prefix="/api")
 app.include_router(hobby_types_router, prefix="/api")
 app.include_router(entries_router, prefix="/api")
 app.include_router(search_router, prefix="/api")
+app.include_router(tags_router, prefix="/api")
 app.include_router(export_router, prefix="/api")
 
 """Serve uploaded files under /api/uploads"""
@@ -134,6 +140,11 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+
+@app.get("/api/health/cache")
+async def cache_stats():
+    return response_cache.stats()
+
 # Lightweight CSRF protection for cookie-auth (bypass in local)
 from starlette.middleware.base import BaseHTTPMiddleware
 
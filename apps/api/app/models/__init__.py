@@ -1,17 +1,21 @@
 from .entry import Entry
 from .entry_media import EntryMedia
 from .entry_prop import EntryProp
+from .entry_summary import EntrySummary
 from .entry_tag import EntryTag
 from .hobby import Hobby
+from .hobby_closure import HobbyClosure
 from .hobby_type import HobbyType
 from .user import User
 
 __all__ = [
     "User",
     "Hobby",
+    "HobbyClosure",
     "HobbyType",
     "Entry",
     "EntryMedia",
     "EntryProp",
+    "EntrySummary",
     "EntryTag",
 ]
@@ -15,9 +15,13 @@ if TYPE_CHECKING:
 class Entry(Base, TimestampMixin):
     __tablename__ = "entry"
     __table_args__ = (
-        Index("idx_entry_hobby", "hobby_id"),
+        # Serves hobby filters and date ranges / newest-first order within one
+        Index("ix_entry_hobby_created", "hobby_id", "created_at"),
         Index("idx_entry_type", "type_key"),
     )
+    # Fetch created_at/updated_at with RETURNING on flush instead of a
+    # refresh SELECT when they are next read
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     hobby_id: Mapped[int] = mapped_column(
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -14,6 +14,9 @@ class EntryProp(Base):
     __table_args__ = (
         UniqueConstraint("entry_id", "key"),
         Index("idx_entryprop_entry", "entry_id"),
+        # Range filters and sorts on typed props; covering, so matches
+        # resolve to entry ids without reading the table
+        Index("ix_entryprop_key_num", "key", "value_num", "entry_id"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -22,6 +25,9 @@ class EntryProp(Base):
     )
     key: Mapped[str] = mapped_column(String(255), nullable=False)
     value_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # value_text as a number for props the type schema declares number,
+    # integer or boolean (1/0); maintained at write time
+    value_num: Mapped[float | None] = mapped_column(Float, nullable=True)
 
     # Relationships
     entry: Mapped["Entry"] = relationship("Entry", back_populates="props")
@@ -0,0 +1,18 @@
+from sqlalchemy import ForeignKey, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class EntrySummary(Base):
+    """Denormalized list-card data for an entry, maintained by SQLite triggers."""
+
+    __tablename__ = "entry_summary"
+
+    entry_id: Mapped[int] = mapped_column(
+        ForeignKey("entry.id", ondelete="CASCADE"), primary_key=True
+    )
+    media_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cover_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    props_json: Mapped[str] = mapped_column(Text, nullable=False, default="{}")
+    excerpt: Mapped[str | None] = mapped_column(Text, nullable=True)
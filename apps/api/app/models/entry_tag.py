@@ -13,7 +13,8 @@ class EntryTag(Base):
     __tablename__ = "entrytag"
     __table_args__ = (
         Index("ix_entrytag_entry", "entry_id"),
-        Index("ix_entrytag_tag", "tag"),
+        # Covers tag lookups and per-tag counts without touching the table
+        Index("ix_entrytag_tag_entry", "tag", "entry_id"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
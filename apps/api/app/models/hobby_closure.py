@@ -0,0 +1,25 @@
+from sqlalchemy import ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class HobbyClosure(Base):
+    """Transitive closure of the hobby tree, maintained by SQLite triggers.
+
+    Every hobby has a depth-0 row pointing at itself, so a subtree filter is a
+    single lookup on ``ancestor_id``.
+    """
+
+    __tablename__ = "hobby_closure"
+    __table_args__ = (
+        Index("ix_hobby_closure_descendant", "descendant_id"),
+    )
+
+    ancestor_id: Mapped[int] = mapped_column(
+        ForeignKey("hobby.id", ondelete="CASCADE"), primary_key=True
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        ForeignKey("hobby.id", ondelete="CASCADE"), primary_key=True
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -4,6 +4,7 @@ from .export import router as export_router
 from .hobbies import router as hobbies_router
 from .hobby_types import router as hobby_types_router
 from .search import router as search_router
+from .tags import router as tags_router
 from .users import router as users_router
 
 __all__ = [
@@ -13,5 +14,6 @@ __all__ = [
     "hobby_types_router",
     "entries_router",
     "search_router",
-    "export_router"
+    "export_router",
+    "tags_router"
 ]
@@ -1,3 +1,5 @@
+from collections.abc import Iterator
+from datetime import datetime
 from typing import Literal
 
 from fastapi import (
@@ -7,10 +9,13 @@ from fastapi import (
     Form,
     HTTPException,
     Query,
+    Request,
+    Response,
     UploadFile,
     status,
 )
-from sqlalchemy import func, text
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from ..auth import get_current_user
@@ -35,7 +40,13 @@ from ..models import (
 )
 from ..schemas import (
     Entry,
+    EntryBatchCreate,
+    EntryBatchResult,
+    EntryBulkEdit,
+    EntryBulkEditResult,
     EntryCreate,
+    EntryDetail,
+    EntryHistogramBucket,
     EntryListItem,
     EntryMedia,
     EntryProp,
@@ -43,140 +54,247 @@ from ..schemas import (
     EntryUpdate,
     PaginatedResponse,
 )
-from ..services.entry_validation import validate_entry_props
+from ..services.entry_bulk import bulk_edit_entries
+from ..services.entry_hydration import (
+    excluded_fields,
+    hydrate_entry_list_items,
+    load_entry_detail,
+    parse_fields,
+    parse_include,
+    public_media,
+    sparse_response,
+)
+from ..services.entry_query import (
+    HistogramBucket,
+    TagMatch,
+    entry_filters,
+    facet_counts,
+    fts_stmt,
+    histogram_stmt,
+    list_stmt,
+)
+from ..services.entry_validation import validate_entries_batch, validate_entry_props
+from ..services.entry_writes import entry_prop_rows, sync_entry_props, sync_entry_tags
+from ..services.pagination import CountMode, cursor_anchor, fetch_page
+from ..services.prop_index import numeric_prop_keys_by_type, prop_filters, prop_sort
+from ..services.response_cache import (
+    ENTRY_DETAIL_TABLES,
+    ENTRY_LIST_TABLES,
+    HOBBY_TABLES,
+    HOBBY_TYPE_TABLES,
+    not_modified,
+    response_cache,
+)
+from ..services.search_ranking import julian_day_now, resolve_ranking
 from ..services.tags import join_tags, normalize_tags
 from ..services.uploads import delete_upload, public_url, store_upload
 
 router = APIRouter(prefix="/entries", tags=["entries"])
 
+# Rows fetched per cursor round trip and hydrated together by /entries/stream
+STREAM_BATCH_SIZE = 500
+
 
 @router.get("/", response_model=PaginatedResponse[EntryListItem])
 def get_entries(
+    request: Request,
+    response: Response,
     q: str | None = Query(None, description="Full-text search query"),
     hobby_id: int | None = Query(None),
     type_key: str | None = Query(None),
-    tag: str | None = Query(None),
+    tag: list[str] | None = Query(None, description="Repeat or comma-separate tags"),
+    match: TagMatch = Query("all", description="Entries need all given tags, or any"),
+    created_from: datetime | None = Query(None, description="Created at or after"),
+    created_to: datetime | None = Query(None, description="Created before"),
     include_descendants: bool = Query(False),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(
+        None, description="Opaque next_cursor from a previous page"
+    ),
+    count: CountMode = Query("exact", description="Total count strategy"),
+    facets: bool = Query(False, description="Include hobby, type and tag counts"),
+    fields: str | None = Query(
+        None, description="Comma-separated item fields, e.g. id,title,thumbnail_url"
+    ),
+    weights: str | None = Query(
+        None, description="Per-column BM25 weights, e.g. title:10,tags:5"
+    ),
+    recency_half_life: float | None = Query(
+        None, gt=0, description="Age in days at which a hit's score is halved"
+    ),
+    sort: str | None = Query(
+        None, description="prop.<key> or -prop.<key> to order by a numeric prop"
+    ),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ) -> PaginatedResponse[EntryListItem]:
-    """Get entries with optional filters and search"""
-
+    """Get entries with optional filters and search.
+
+    Pass ``next_cursor`` back as ``cursor`` for keyset pagination that stays
+    fast at any depth; ``offset`` is still honoured for compatibility.
+
+    ``fields`` limits each item to the named fields and skips the columns
+    and summary join the others would need; ``excerpt`` (a short
+    single-line description) is only returned when requested.
+
+    Typed props filter as ``prop.<key>[op]=value`` with ``op`` one of eq,
+    ne, gt, gte, lt, lte (``prop.<key>=value`` means eq), e.g.
+    ``prop.iso[gte]=800``. ``sort=prop.<key>`` (``-prop.<key>`` for
+    descending) orders by a numeric prop instead of date or rank.
+
+    Responses carry an ETag; a matching ``If-None-Match`` gets ``304``.
+    """
+    field_set = parse_fields(fields)
+    cache_key = response_cache.make_key(request, ENTRY_LIST_TABLES)
+    unchanged = not_modified(request, response, cache_key)
+    if unchanged is not None:
+        return unchanged
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    filters = entry_filters(
+        hobby_id, type_key, tag, include_descendants, match, created_from, created_to
+    )
+    filters += prop_filters(request.query_params)
+    anchor = None
     if q:
         # Full-text search using FTS5, order by BM25 rank (lower is better)
-        id_query = text(
-            """
-            SELECT e.id AS id
-            FROM entry AS e
-            JOIN entry_fts ON entry_fts.rowid = e.id
-            WHERE entry_fts MATCH :query
-            ORDER BY bm25(entry_fts), e.created_at DESC
-            LIMIT :limit OFFSET :offset
-            """
-        )
-        count_query = text(
-            """
-            SELECT COUNT(*)
-            FROM entry AS e
-            JOIN entry_fts ON entry_fts.rowid = e.id
-            WHERE entry_fts MATCH :query
-            """
-        )
-        params = {"query": q, "limit": limit, "offset": offset}
-        id_rows = session.execute(id_query, params).fetchall()
-        ids = [row[0] for row in id_rows]
-        total = int(session.execute(count_query, {"query": q}).scalar() or 0)
-        if ids:
-            entries = (
-                session.query(EntryModel)
-                .filter(EntryModel.id.in_(ids))
-                .all()
-            )
-            # Preserve order from FTS result
-            by_id = {e.id: e for e in entries}
-            entries = [by_id[i] for i in ids if i in by_id]
-        else:
-            entries = []
+        ranking = resolve_ranking(session, hobby_id, weights, recency_half_life)
+        if ranking.half_life_days:
+            # Measure ages from the first page's time on every page
+            ranking.now = anchor = cursor_anchor(cursor, float) or julian_day_now()
+        stmt = fts_stmt(q, filters, ranking)
+        sort_desc, sort_type = False, float
     else:
-        # Regular query with filters
-        query = session.query(EntryModel)
-
-        if hobby_id:
-            if include_descendants:
-                ids = [hobby_id]
-                queue = [hobby_id]
-                while queue:
-                    hid = queue.pop(0)
-                    for (cid,) in session.query(HobbyModel.id).filter(
-                        HobbyModel.parent_id == hid
-                    ).all():
-                        ids.append(cid)
-                        queue.append(cid)
-                query = query.filter(EntryModel.hobby_id.in_(ids))
-            else:
-                query = query.filter(EntryModel.hobby_id == hobby_id)
-        if type_key:
-            query = query.filter(EntryModel.type_key == type_key)
-        if tag:
-            query = query.join(
-                EntryTagModel, EntryTagModel.entry_id == EntryModel.id
-            ).filter(EntryTagModel.tag == tag.lower())
-
-        total = query.count()
-        entries = (
-            query.order_by(EntryModel.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
-        )
+        stmt = list_stmt(filters)
+        sort_desc, sort_type = True, str
+    if sort:
+        stmt, sort_desc = prop_sort(stmt, sort)
+        sort_type = float
+    page = fetch_page(
+        session, stmt, sort_desc=sort_desc, sort_type=sort_type,
+        limit=limit, offset=offset, cursor=cursor, count=count, anchor=anchor,
+    )
 
-    # Convert to EntryListItem format
-    items = []
-    for entry in entries:
-        entry_obj = entry
-
-        # Get media count and thumbnail
-        media_count = session.query(func.count(EntryMediaModel.id)).filter(
-            EntryMediaModel.entry_id == entry_obj.id
-        ).scalar()
-
-        thumbnail = session.query(EntryMediaModel).filter(
-            EntryMediaModel.entry_id == entry_obj.id,
-            EntryMediaModel.kind == "image"
-        ).first()
-
-        # Get props as dict
-        props = {}
-        entry_props = session.query(EntryPropModel).filter(
-            EntryPropModel.entry_id == entry_obj.id
-        ).all()
-        for prop in entry_props:
-            props[prop.key] = prop.value_text
-
-        item = EntryListItem(
-            id=entry_obj.id,
-            hobby_id=entry_obj.hobby_id,
-            type_key=entry_obj.type_key,
-            title=entry_obj.title,
-            description=entry_obj.description,
-            tags=entry_obj.tags,
-            created_at=entry_obj.created_at,
-            updated_at=entry_obj.updated_at,
-            media_count=media_count,
-            thumbnail_url=public_url(thumbnail.file_path) if thumbnail else None,
-            props=props
-        )
-        items.append(item)
+    items = hydrate_entry_list_items(session, page.ids, field_set)
 
-    return PaginatedResponse(
+    result = PaginatedResponse(
         items=items,
-        total=total,
+        total=page.total,
         limit=limit,
         offset=offset,
-        has_more=offset + limit < total
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
+        total_capped=page.total_capped,
+        facets=facet_counts(session, stmt) if facets else None,
+    )
+    result = sparse_response(result, field_set, response.headers)
+    response_cache.set(cache_key, result)
+    return result
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+def stream_entries(
+    request: Request,
+    q: str | None = Query(None, description="Full-text search query"),
+    hobby_id: int | None = Query(None),
+    type_key: str | None = Query(None),
+    tag: list[str] | None = Query(None, description="Repeat or comma-separate tags"),
+    match: TagMatch = Query("all", description="Entries need all given tags, or any"),
+    created_from: datetime | None = Query(None, description="Created at or after"),
+    created_to: datetime | None = Query(None, description="Created before"),
+    include_descendants: bool = Query(False),
+    fields: str | None = Query(
+        None, description="Comma-separated item fields, e.g. id,title,thumbnail_url"
+    ),
+    sort: str | None = Query(
+        None, description="prop.<key> or -prop.<key> to order by a numeric prop"
+    ),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+) -> StreamingResponse:
+    """Stream every matching entry as newline-delimited JSON.
+
+    Takes the same filters as ``GET /entries`` and emits one
+    ``EntryListItem`` per line in the same order, without pagination or
+    counts. Ids are read through a server-side cursor in batches of
+    ``STREAM_BATCH_SIZE`` and each batch is hydrated with one query, so
+    memory stays flat however large the journal is.
+    """
+    field_set = parse_fields(fields)
+    excluded = excluded_fields(field_set)
+
+    filters = entry_filters(
+        hobby_id, type_key, tag, include_descendants, match, created_from, created_to
+    )
+    filters += prop_filters(request.query_params)
+    stmt = fts_stmt(q, filters) if q else list_stmt(filters)
+    sort_desc = not q
+    if sort:
+        stmt, sort_desc = prop_sort(stmt, sort)
+    sort_key = stmt.selected_columns.sort_key
+    stmt = stmt.order_by(
+        sort_key.desc() if sort_desc else sort_key.asc(),
+        stmt.selected_columns.id.desc(),
+    )
+
+    def generate() -> Iterator[str]:
+        result = session.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+        for rows in result.partitions():
+            ids = [row.id for row in rows]
+            for item in hydrate_entry_list_items(session, ids, field_set):
+                yield item.model_dump_json(exclude=excluded) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@router.get("/histogram", response_model=list[EntryHistogramBucket])
+def get_entries_histogram(
+    request: Request,
+    response: Response,
+    bucket: HistogramBucket = Query("day", description="Period each count covers"),
+    q: str | None = Query(None, description="Full-text search query"),
+    hobby_id: int | None = Query(None),
+    type_key: str | None = Query(None),
+    tag: list[str] | None = Query(None, description="Repeat or comma-separate tags"),
+    match: TagMatch = Query("all", description="Entries need all given tags, or any"),
+    created_from: datetime | None = Query(None, description="Created at or after"),
+    created_to: datetime | None = Query(None, description="Created before"),
+    include_descendants: bool = Query(False),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+) -> list[EntryHistogramBucket]:
+    """Count entries per day, week (from Monday) or month of ``created_at``.
+
+    Takes the same filters as ``GET /entries`` and runs one grouped query.
+    Each bucket is labelled by its first day; empty buckets are omitted.
+    Responses carry an ETag; a matching ``If-None-Match`` gets ``304``.
+    """
+    cache_key = response_cache.make_key(request, ENTRY_LIST_TABLES)
+    unchanged = not_modified(request, response, cache_key)
+    if unchanged is not None:
+        return unchanged
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    filters = entry_filters(
+        hobby_id, type_key, tag, include_descendants, match, created_from, created_to
     )
+    filters += prop_filters(request.query_params)
+    stmt = fts_stmt(q, filters) if q else list_stmt(filters)
+    result = [
+        EntryHistogramBucket(bucket=start, count=count)
+        for start, count in session.execute(histogram_stmt(stmt, bucket)).tuples()
+    ]
+    response_cache.set(cache_key, result)
+    return result
 
 
 @router.post("/", response_model=Entry)
@@ -184,30 +302,160 @@ def create_entry(
     entry_data: EntryCreate,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
-) -> EntryModel:
-    """Create a new entry"""
+) -> Entry:
+    """Create a new entry with its tags in one transaction"""
     data = entry_data.model_dump()
     tag_list = normalize_tags(data.get("tags"))
     data["tags"] = join_tags(tag_list) if tag_list else None
-    entry = EntryModel(**data)
+    # Empty collections are known up front, so building the response needs
+    # no lazy loads
+    entry = EntryModel(**data, media=[], props=[])
     session.add(entry)
+    session.flush()
+    sync_entry_tags(session, entry.id, tag_list)
+    result = Entry.model_validate(entry)
     session.commit()
-    session.refresh(entry)
-    if tag_list:
-        for t in tag_list:
-            session.add(EntryTagModel(entry_id=entry.id, tag=t))
-        session.commit()
-    return entry
+    return result
 
 
-@router.get("/{entry_id}", response_model=Entry)
+@router.post("/batch", response_model=EntryBatchResult)
+def create_entries_batch(
+    batch: EntryBatchCreate,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+) -> EntryBatchResult:
+    """Create many entries with their tags and props in one transaction.
+
+    Every entry is validated first (hobby, type and props against the type
+    schema) and nothing is written if any fails. Entries, tags and props
+    are then inserted with one bulk statement each and committed once.
+    Ids are returned in request order.
+    """
+    validation_result = validate_entries_batch(
+        session, [(item.hobby_id, item.type_key, item.props) for item in batch.entries]
+    )
+    if not validation_result["valid"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Validation failed: {'; '.join(validation_result['errors'])}"
+        )
+
+    entry_rows = []
+    tag_lists = []
+    for item in batch.entries:
+        tag_list = normalize_tags(item.tags)
+        tag_lists.append(tag_list)
+        entry_rows.append({
+            "hobby_id": item.hobby_id,
+            "type_key": item.type_key,
+            "title": item.title,
+            "description": item.description,
+            "tags": join_tags(tag_list) if tag_list else None,
+        })
+
+    ids = list(session.scalars(
+        insert(EntryModel).returning(EntryModel.id, sort_by_parameter_order=True),
+        entry_rows,
+    ))
+
+    tag_rows = [
+        {"entry_id": entry_id, "tag": t}
+        for entry_id, tag_list in zip(ids, tag_lists, strict=True)
+        for t in tag_list
+    ]
+    numeric_keys = numeric_prop_keys_by_type(
+        session, {item.type_key for item in batch.entries}
+    )
+    prop_rows = [
+        row
+        for entry_id, item in zip(ids, batch.entries, strict=True)
+        for row in entry_prop_rows(entry_id, item.props, numeric_keys[item.type_key])
+    ]
+    if tag_rows:
+        session.execute(insert(EntryTagModel), tag_rows)
+    if prop_rows:
+        session.execute(insert(EntryPropModel), prop_rows)
+
+    session.commit()
+    return EntryBatchResult(ids=ids)
+
+
+@router.post("/bulk-edit", response_model=EntryBulkEditResult)
+def bulk_edit(
+    edit: EntryBulkEdit,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+) -> EntryBulkEditResult:
+    """Apply one operation to every entry matching ``filter``.
+
+    ``filter`` takes the same fields as ``GET /entries``. Operations:
+
+    - ``move_hobby``: move entries to ``hobby_id``
+    - ``add_tag`` / ``remove_tag``: add or remove ``tag``, keeping the
+      ``entry.tags`` column in step with the tag rows
+    - ``delete_prop``: delete prop ``key``; requires ``filter.type_key``
+
+    Runs as a handful of set-based statements in one transaction and
+    returns how many entries matched and how many rows changed.
+    """
+    def invalid(detail: str) -> HTTPException:
+        return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+    tag = None
+    if edit.operation == "move_hobby":
+        if edit.hobby_id is None:
+            raise invalid("move_hobby requires hobby_id")
+        if session.get(HobbyModel, edit.hobby_id) is None:
+            raise invalid(f"Hobby {edit.hobby_id} not found")
+    elif edit.operation in ("add_tag", "remove_tag"):
+        tag_list = normalize_tags(edit.tag)
+        if len(tag_list) != 1:
+            raise invalid(f"{edit.operation} requires a single tag")
+        tag = tag_list[0]
+    elif not edit.key or not edit.filter.type_key:
+        raise invalid("delete_prop requires key and filter.type_key")
+
+    f = edit.filter
+    filters = entry_filters(
+        f.hobby_id, f.type_key, f.tag, f.include_descendants, f.match,
+        f.created_from, f.created_to,
+    )
+    stmt = fts_stmt(f.q, filters) if f.q else list_stmt(filters)
+    matched, affected = bulk_edit_entries(
+        session, stmt, edit.operation, hobby_id=edit.hobby_id, tag=tag, key=edit.key
+    )
+    session.commit()
+    return EntryBulkEditResult(matched=matched, affected=affected)
+
+
+@router.get("/{entry_id}", response_model=EntryDetail)
 def get_entry(
     entry_id: int,
+    request: Request,
+    response: Response,
+    include: str | None = Query(
+        None, description="Comma-separated related records to embed: hobby,type"
+    ),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
-) -> EntryModel:
-    """Get a specific entry"""
-    entry = session.query(EntryModel).filter(EntryModel.id == entry_id).first()
+) -> EntryDetail | Response:
+    """Get a specific entry with its media, props and tags.
+
+    Loaded in a fixed number of queries whatever the entry holds; media
+    paths are public URLs as on ``/entries/{id}/media``. ``include`` embeds
+    the hobby and/or hobby type. Honours ``If-None-Match`` with ``304``.
+    """
+    include_set = parse_include(include)
+    tables = ENTRY_DETAIL_TABLES
+    if "hobby" in include_set:
+        tables += HOBBY_TABLES
+    if "type" in include_set:
+        tables += HOBBY_TYPE_TABLES
+    cache_key = response_cache.make_key(request, tables)
+    unchanged = not_modified(request, response, cache_key)
+    if unchanged is not None:
+        return unchanged
+    entry = load_entry_detail(session, entry_id, include_set)
     if not entry:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -222,7 +470,7 @@ def update_entry(
     entry_update: EntryUpdate,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
-) -> EntryModel:
+) -> Entry:
     """Update an entry"""
     entry = session.query(EntryModel).filter(EntryModel.id == entry_id).first()
     if not entry:
@@ -232,20 +480,18 @@ def update_entry(
         )
 
     update_data = entry_update.model_dump(exclude_unset=True)
-    # Handle tags
+    # Handle tags; only added and removed tags touch entrytag
     if "tags" in update_data:
-        tag_list = normalize_tags(update_data.get("tags"))
+        tag_list = normalize_tags(update_data.pop("tags"))
         entry.tags = join_tags(tag_list) if tag_list else None
-        session.query(EntryTagModel).filter(EntryTagModel.entry_id == entry.id).delete()
-        for t in tag_list:
-            session.add(EntryTagModel(entry_id=entry.id, tag=t))
-        update_data.pop("tags", None)
+        sync_entry_tags(session, entry.id, tag_list)
     for field, value in update_data.items():
         setattr(entry, field, value)
 
+    session.flush()
+    result = Entry.model_validate(entry)
     session.commit()
-    session.refresh(entry)
-    return entry
+    return result
 
 
 @router.delete("/{entry_id}")
@@ -314,24 +560,13 @@ def add_or_replace_entry_props(
             )
         )
 
-    # Remove existing props and add new ones
-    session.query(EntryPropModel).filter(EntryPropModel.entry_id == entry_id).delete()
-
-    new_props = []
-    for prop_data in props_data.props:
-        prop = EntryPropModel(
-            entry_id=entry_id,
-            key=prop_data.key,
-            value_text=prop_data.value_text
-        )
-        session.add(prop)
-        new_props.append(prop)
-
+    # Upsert new and changed props, drop the rest, leave unchanged ones alone
+    numeric_keys = numeric_prop_keys_by_type(session, [entry.type_key])[entry.type_key]
+    rows = entry_prop_rows(entry_id, props_data.props, numeric_keys)
+    props = sync_entry_props(session, entry_id, rows)
+    result = [EntryProp.model_validate(prop) for prop in props]
     session.commit()
-    for prop in new_props:
-        session.refresh(prop)
-
-    return new_props
+    return result
 
 
 @router.delete("/{entry_id}/props/{key}")
@@ -422,19 +657,7 @@ def get_entry_media(
         .all()
     )
     # Map file_path to public URL for client
-    return [
-        EntryMedia(
-            id=m.id,
-            entry_id=m.entry_id,
-            kind=m.kind,
-            file_path=public_url(m.file_path),
-            width=m.width,
-            height=m.height,
-            duration=m.duration,
-            meta_json=m.meta_json,
-        )
-        for m in items
-    ]
+    return [public_media(m) for m in items]
 
 
 @router.delete("/{entry_id}/media/{media_id}")
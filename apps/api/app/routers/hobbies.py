@@ -1,13 +1,22 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from ..auth import get_current_user
 from ..db import get_session
 from ..models import Hobby as HobbyModel
+from ..models import HobbyClosure as HobbyClosureModel
 from ..models import User
 from ..schemas import Hobby, HobbyCreate, HobbyUpdate
-from ..services.hobby_tree import ensure_unique_slug, get_hobby_tree, slugify
+from ..services.hobby_tree import (
+    ensure_unique_slug,
+    get_hobby_subtree,
+    get_hobby_tree,
+    slugify,
+)
+from ..services.response_cache import HOBBY_TABLES, not_modified, response_cache
 
 router = APIRouter(prefix="/hobbies", tags=["hobbies"])
 
@@ -15,36 +24,44 @@ router = APIRouter(prefix="/hobbies", tags=["hobbies"])
 @router.get("/", response_model=list[Hobby])
 def get_hobbies(
     parent_id: int | None = None,
+    depth: int | None = Query(None, ge=0, description="Levels of children to nest"),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ) -> list[Hobby]:
     """Get hobbies, optionally filtered by parent_id"""
-    query = session.query(HobbyModel)
-    if parent_id is not None:
-        query = query.filter(HobbyModel.parent_id == parent_id)
-    else:
-        query = query.filter(HobbyModel.parent_id.is_(None))
-
-    return query.all()
+    return get_hobby_tree(session, parent_id, depth)
 
 
 @router.get("/tree", response_model=list[Hobby])
 def get_hobbies_tree(
+    request: Request,
+    response: Response,
+    depth: int | None = Query(None, ge=0, description="Levels of children to nest"),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ) -> list[Hobby]:
     """Return hierarchical hobby tree sorted by sort_order."""
-    return get_hobby_tree(session)
+    cache_key = response_cache.make_key(request, HOBBY_TABLES)
+    unchanged = not_modified(request, response, cache_key)
+    if unchanged is not None:
+        return unchanged
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    tree = get_hobby_tree(session, depth=depth)
+    response_cache.set(cache_key, tree)
+    return tree
 
 
 @router.get("/{hobby_id}", response_model=Hobby)
 def get_hobby(
     hobby_id: int,
+    depth: int | None = Query(None, ge=0, description="Levels of children to nest"),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
-) -> HobbyModel:
+) -> dict[str, Any]:
     """Get a specific hobby including config_json"""
-    hobby = session.query(HobbyModel).filter(HobbyModel.id == hobby_id).first()
+    hobby = get_hobby_subtree(session, hobby_id, depth)
     if not hobby:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -56,15 +73,11 @@ def get_hobby(
 @router.get("/{hobby_id}/children", response_model=list[Hobby])
 def get_children(
     hobby_id: int,
+    depth: int | None = Query(None, ge=0, description="Levels of children to nest"),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ) -> list[Hobby]:
-    return (
-        session.query(HobbyModel)
-        .filter(HobbyModel.parent_id == hobby_id)
-        .order_by(HobbyModel.sort_order, HobbyModel.id)
-        .all()
-    )
+    return get_hobby_tree(session, hobby_id, depth)
 
 
 @router.post("/", response_model=Hobby)
@@ -72,7 +85,7 @@ def create_hobby(
     hobby_data: HobbyCreate,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
-) -> HobbyModel:
+) -> dict[str, Any]:
     """Create a new hobby"""
     # Check if name already exists
     existing = (
@@ -94,8 +107,7 @@ def create_hobby(
     hobby = HobbyModel(**data)
     session.add(hobby)
     session.commit()
-    session.refresh(hobby)
-    return hobby
+    return get_hobby_subtree(session, hobby.id)
 
 
 @router.patch("/{hobby_id}", response_model=Hobby)
@@ -104,7 +116,7 @@ def update_hobby(
     hobby_update: HobbyUpdate,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
-) -> HobbyModel:
+) -> dict[str, Any]:
     """Update a hobby"""
     hobby = session.query(HobbyModel).filter(HobbyModel.id == hobby_id).first()
     if not hobby:
@@ -130,12 +142,27 @@ def update_hobby(
                 detail="Hobby with this name already exists"
             )
 
+    # Reject reparenting under the hobby itself or one of its descendants
+    if update_data.get("parent_id") is not None:
+        in_subtree = session.query(
+            session.query(HobbyClosureModel)
+            .filter(
+                HobbyClosureModel.ancestor_id == hobby_id,
+                HobbyClosureModel.descendant_id == update_data["parent_id"],
+            )
+            .exists()
+        ).scalar()
+        if in_subtree:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Hobby cannot be moved under itself or its descendants"
+            )
+
     for field, value in update_data.items():
         setattr(hobby, field, value)
 
     session.commit()
-    session.refresh(hobby)
-    return hobby
+    return get_hobby_subtree(session, hobby_id)
 
 
 @router.delete("/{hobby_id}")
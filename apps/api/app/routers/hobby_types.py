@@ -1,5 +1,5 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
 from ..auth import get_current_user
@@ -7,6 +7,8 @@ from ..db import get_session
 from ..models import HobbyType as HobbyTypeModel
 from ..models import User
 from ..schemas import HobbyType, HobbyTypeCreate, HobbyTypeUpdate
+from ..services.prop_index import reindex_prop_values
+from ..services.response_cache import HOBBY_TYPE_TABLES, not_modified, response_cache
 from ..services.schema_validation import is_valid_json_schema
 
 router = APIRouter(prefix="/hobby-types", tags=["hobby-types"])
@@ -16,11 +18,24 @@ router = APIRouter(prefix="/hobby-types", tags=["hobby-types"])
 
 @router.get("/", response_model=list[HobbyType])
 def get_hobby_types(
+    request: Request,
+    response: Response,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     """Get all hobby types"""
-    return session.query(HobbyTypeModel).all()
+    cache_key = response_cache.make_key(request, HOBBY_TYPE_TABLES)
+    unchanged = not_modified(request, response, cache_key)
+    if unchanged is not None:
+        return unchanged
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    hobby_types = [
+        HobbyType.model_validate(ht) for ht in session.query(HobbyTypeModel).all()
+    ]
+    response_cache.set(cache_key, hobby_types)
+    return hobby_types
 
 
 @router.post("/", response_model=HobbyType)
@@ -79,6 +94,10 @@ def update_hobby_type(
 
     for field, value in update_data.items():
         setattr(hobby_type, field, value)
+    if "schema_json" in update_data:
+        # Prop types may have changed; keep the typed prop index in step
+        session.flush()
+        reindex_prop_values(session, key)
 
     session.commit()
     session.refresh(hobby_type)
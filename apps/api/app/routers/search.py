@@ -1,28 +1,57 @@
 import re
+import unicodedata
+from datetime import datetime
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, text
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from ..auth import get_current_user
+from ..db.fts import TRIGRAM_SUPPORTED
 from ..db.session import get_session
 from ..models import (
-    Entry as EntryModel,
+    User,
 )
-from ..models import (
-    EntryMedia as EntryMediaModel,
+from ..schemas import (
+    EntryListItem,
+    PaginatedResponse,
+    SuggestResponse,
+    TermSuggestion,
+    TitleSuggestion,
 )
-from ..models import (
-    EntryProp as EntryPropModel,
+from ..services.entry_hydration import (
+    hydrate_entry_list_items,
+    parse_fields,
+    sparse_response,
 )
-from ..models import (
-    Hobby as HobbyModel,
+from ..services.entry_query import (
+    TagMatch,
+    entry_filters,
+    entry_fts,
+    entry_trigram,
+    facet_counts,
+    fts_highlights,
+    fts_stmt,
+    substring_query,
+    substring_stmt,
 )
-from ..models import (
-    User,
+from ..services.pagination import CountMode, cursor_anchor, fetch_page
+from ..services.prop_index import prop_filters
+from ..services.response_cache import (
+    ENTRY_LIST_TABLES,
+    not_modified,
+    response_cache,
 )
-from ..schemas import EntryListItem, PaginatedResponse
-from ..services.uploads import public_url
+from ..services.search_ranking import julian_day_now, resolve_ranking
 
 router = APIRouter(prefix="/search", tags=["search"])
 
@@ -57,123 +86,215 @@ def sanitize_fts_query(query: str) -> str:
     return sanitized
 
 
+def sanitize_substring_query(query: str) -> str:
+    """
+    Validate a raw fragment for trigram substring search.
+    Punctuation is kept as typed; the fragment is quoted as one phrase.
+    """
+    if not TRIGRAM_SUPPORTED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Substring search is not available"
+        )
+
+    fragment = query.strip()[:200]
+    if len(fragment) < 3:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Substring search needs at least 3 characters"
+        )
+
+    return fragment
+
+
 @router.get("/", response_model=PaginatedResponse[EntryListItem])
 def search_entries(
+    request: Request,
+    response: Response,
     q: str = Query(..., description="Search query"),
+    mode: Literal["fts", "substring"] = Query(
+        "fts", description="fts: tokenized full-text; substring: trigram fragment match"
+    ),
     hobby_id: int | None = Query(None),
     include_descendants: bool = Query(True),
     type_key: str | None = Query(None),
-    tag: str | None = Query(None),
+    tag: list[str] | None = Query(None, description="Repeat or comma-separate tags"),
+    match: TagMatch = Query("all", description="Entries need all given tags, or any"),
+    created_from: datetime | None = Query(None, description="Created at or after"),
+    created_to: datetime | None = Query(None, description="Created before"),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(
+        None, description="Opaque next_cursor from a previous page"
+    ),
+    count: CountMode = Query("exact", description="Total count strategy"),
+    facets: bool = Query(False, description="Include hobby, type and tag counts"),
+    fields: str | None = Query(
+        None, description="Comma-separated item fields, e.g. id,title,thumbnail_url"
+    ),
+    weights: str | None = Query(
+        None, description="Per-column BM25 weights, e.g. title:10,tags:5"
+    ),
+    recency_half_life: float | None = Query(
+        None, gt=0, description="Age in days at which a hit's score is halved"
+    ),
+    highlight: bool = Query(False, description="Mark matches and return an excerpt"),
+    highlight_start: str = Query("<mark>", max_length=32),
+    highlight_end: str = Query("</mark>", max_length=32),
+    snippet_tokens: int = Query(16, ge=1, le=64),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    """Search entries using full-text search with optional filters"""
+    """Search entries using full-text search with optional filters.
+
+    Results are ordered by ``(rank, id)``; pass ``next_cursor`` back as
+    ``cursor`` to continue from the last hit without an OFFSET scan.
+
+    With ``highlight=true`` matched terms in the title are wrapped in the
+    highlight markers and ``description`` is replaced by an ``excerpt`` of
+    at most ``snippet_tokens`` tokens around the best match.
+
+    ``weights`` and ``recency_half_life`` override the ranking defaults set
+    under ``search`` in the filtered hobby's ``config_json``. With a
+    recency half-life the cursor also pins the time ages are measured
+    from, so later pages rank hits exactly as the first did.
+
+    ``mode=substring`` matches ``q`` literally inside title, description
+    or tags (e.g. ``70-200``) using the trigram index; ranking options do
+    not apply to it.
+
+    ``fields`` limits each item to the named fields and ``prop.<key>[op]``
+    filters typed props, as on ``/entries``;
+    highlighting always returns ``excerpt``. Responses carry an ETag and a
+    matching ``If-None-Match`` gets ``304``.
+    """
 
     # Sanitize the search query
-    sanitized_query = sanitize_fts_query(q)
+    if mode == "substring":
+        sanitized_query = sanitize_substring_query(q)
+    else:
+        sanitized_query = sanitize_fts_query(q)
+    field_set = parse_fields(fields)
+    if field_set is not None and highlight:
+        field_set |= {"excerpt"}
 
-    # Build the base FTS ID query with BM25 rank
-    base_query = (
-        "SELECT e.id AS id FROM entry AS e "
-        "JOIN entry_fts ON entry_fts.rowid = e.id "
-        "WHERE entry_fts MATCH :query"
+    cache_key = response_cache.make_key(request, ENTRY_LIST_TABLES)
+    unchanged = not_modified(request, response, cache_key)
+    if unchanged is not None:
+        return unchanged
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    filters = entry_filters(
+        hobby_id, type_key, tag, include_descendants, match, created_from, created_to
     )
-    base_count = (
-        "SELECT COUNT(*) FROM entry AS e "
-        "JOIN entry_fts ON entry_fts.rowid = e.id "
-        "WHERE entry_fts MATCH :query"
+    filters += prop_filters(request.query_params)
+    anchor = None
+    if mode == "substring":
+        stmt = substring_stmt(sanitized_query, filters)
+        index, match_query = entry_trigram, substring_query(sanitized_query)
+    else:
+        ranking = resolve_ranking(session, hobby_id, weights, recency_half_life)
+        if ranking.half_life_days:
+            # Measure ages from the first page's time on every page
+            ranking.now = anchor = cursor_anchor(cursor, float) or julian_day_now()
+        stmt = fts_stmt(sanitized_query, filters, ranking)
+        index, match_query = entry_fts, sanitized_query
+    page = fetch_page(
+        session, stmt, sort_desc=False, sort_type=float,
+        limit=limit, offset=offset, cursor=cursor, count=count, anchor=anchor,
     )
 
-    params = {"query": sanitized_query}
-
-    # Add filters
-    if hobby_id:
-        if include_descendants:
-            ids: list[int] = [hobby_id]
-            queue = [hobby_id]
-            while queue:
-                hid = queue.pop(0)
-                for (cid,) in session.query(HobbyModel.id).filter(HobbyModel.parent_id == hid).all():
-                    ids.append(cid)
-                    queue.append(cid)
-            if ids:
-                base_query += f" AND e.hobby_id IN ({','.join(str(i) for i in ids)})"
-                base_count += f" AND e.hobby_id IN ({','.join(str(i) for i in ids)})"
-        else:
-            base_query += " AND e.hobby_id = :hobby_id"
-            base_count += " AND e.hobby_id = :hobby_id"
-            params["hobby_id"] = hobby_id
-
-    if type_key:
-        base_query += " AND e.type_key = :type_key"
-        base_count += " AND e.type_key = :type_key"
-        params["type_key"] = type_key
-
-    if tag:
-        base_query += (
-            " AND EXISTS (SELECT 1 FROM entrytag et WHERE et.entry_id = e.id AND et.tag = :tag)"
-        )
-        base_count += (
-            " AND EXISTS (SELECT 1 FROM entrytag et WHERE et.entry_id = e.id AND et.tag = :tag)"
+    items = hydrate_entry_list_items(session, page.ids, field_set)
+    if highlight:
+        marks = fts_highlights(
+            session, match_query, page.ids,
+            start=highlight_start, end=highlight_end, tokens=snippet_tokens,
+            index=index,
         )
-        params["tag"] = tag.lower()
-
-    # Add ordering and pagination
-    search_query = base_query + " ORDER BY bm25(entry_fts), e.created_at DESC LIMIT :limit OFFSET :offset"
-    params.update({"limit": limit, "offset": offset})
-
-    # Execute queries
-    id_rows = session.execute(text(search_query), params).fetchall()
-    total = int(session.execute(text(base_count), params).scalar() or 0)
-
-    ids = [row[0] for row in id_rows]
-    items: list[EntryListItem] = []
-    if ids:
-        entries = session.query(EntryModel).filter(EntryModel.id.in_(ids)).all()
-        by_id = {e.id: e for e in entries}
-        ordered = [by_id[i] for i in ids if i in by_id]
-        
-        # Convert to EntryListItem format
-        for entry in ordered:
-            # Get media count and thumbnail
-            media_count = session.query(func.count(EntryMediaModel.id)).filter(
-                EntryMediaModel.entry_id == entry.id
-            ).scalar() or 0
-
-            thumbnail = session.query(EntryMediaModel).filter(
-                EntryMediaModel.entry_id == entry.id,
-                EntryMediaModel.kind == "image"
-            ).first()
-
-            # Get props as dict
-            props = {}
-            entry_props = session.query(EntryPropModel).filter(
-                EntryPropModel.entry_id == entry.id
-            ).all()
-            for prop in entry_props:
-                props[prop.key] = prop.value_text
-
-            item = EntryListItem(
-                id=entry.id,
-                hobby_id=entry.hobby_id,
-                type_key=entry.type_key,
-                title=entry.title,
-                description=entry.description,
-                tags=entry.tags,
-                created_at=entry.created_at,
-                updated_at=entry.updated_at,
-                media_count=media_count,
-                thumbnail_url=public_url(thumbnail.file_path) if thumbnail else None,
-                props=props
-            )
-            items.append(item)
-
-    return PaginatedResponse(
+        for item in items:
+            if item.id in marks:
+                title, excerpt = marks[item.id]
+                item.title = title
+                item.excerpt = excerpt or None
+            item.description = None
+
+    result = PaginatedResponse(
         items=items,
-        total=total,
+        total=page.total,
         limit=limit,
         offset=offset,
-        has_more=offset + limit < total
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
+        total_capped=page.total_capped,
+        facets=facet_counts(session, stmt) if facets else None,
+    )
+    result = sparse_response(result, field_set, response.headers)
+    response_cache.set(cache_key, result)
+    return result
+
+
+def suggest_tokens(query: str) -> list[str]:
+    """
+    Split a partial query into tokens normalized the way the unicode61
+    tokenizer stores them: lowercase, without diacritics.
+    """
+    decomposed = unicodedata.normalize("NFKD", query.lower())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return re.findall(r"\w+", stripped)[:8]
+
+
+@router.get("/suggest", response_model=SuggestResponse)
+def suggest(
+    request: Request,
+    q: str = Query(..., description="Partial search query"),
+    limit: int = Query(5, ge=1, le=10),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Prefix completions for the search box.
+
+    The last token is treated as a prefix: terms come from the
+    ``entry_fts_vocab`` table ranked by document count, titles from a
+    prefix MATCH on the title column. No per-entry hydration is done.
+    """
+    tokens = suggest_tokens(q)
+    if not tokens:
+        return SuggestResponse(terms=[], titles=[])
+
+    cache_key = response_cache.make_key(request, ENTRY_LIST_TABLES)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    prefix = tokens[-1]
+    # Upper bound of the term range: the prefix with its last char bumped
+    prefix_end = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    term_rows = session.execute(
+        text(
+            "SELECT term, doc FROM entry_fts_vocab "
+            "WHERE term >= :prefix AND term < :prefix_end "
+            "ORDER BY doc DESC, term LIMIT :limit"
+        ),
+        {"prefix": prefix, "prefix_end": prefix_end, "limit": limit},
+    ).fetchall()
+
+    phrase = " ".join(f'"{t}"' for t in tokens[:-1])
+    match = f'title : ({phrase} "{prefix}"*)'
+    title_rows = session.execute(
+        text(
+            "SELECT e.id, e.title FROM entry_fts "
+            "JOIN entry AS e ON e.id = entry_fts.rowid "
+            "WHERE entry_fts MATCH :match "
+            "ORDER BY entry_fts.rank LIMIT :limit"
+        ),
+        {"match": match, "limit": limit},
+    ).fetchall()
+
+    response = SuggestResponse(
+        terms=[TermSuggestion(term=term, count=doc) for term, doc in term_rows],
+        titles=[TitleSuggestion(id=id_, title=title) for id_, title in title_rows],
     )
+    response_cache.set(cache_key, response)
+    return response
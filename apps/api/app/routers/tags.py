@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from ..auth import get_current_user
+from ..db import get_session
+from ..models import User
+from ..schemas import TagCount
+from ..services.entry_query import entry_filters
+from ..services.response_cache import TAG_TABLES, not_modified, response_cache
+from ..services.tags import tag_counts
+
+router = APIRouter(prefix="/tags", tags=["tags"])
+
+
+@router.get("/", response_model=list[TagCount])
+def get_tags(
+    request: Request,
+    response: Response,
+    prefix: str | None = Query(None, description="Only tags starting with this text"),
+    hobby_id: int | None = Query(None),
+    type_key: str | None = Query(None),
+    include_descendants: bool = Query(False),
+    limit: int = Query(50, ge=1, le=500),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Get tags with usage counts, most used first.
+
+    Serves tag clouds (top ``limit``) and autocomplete (``prefix``),
+    optionally scoped to a hobby or entry type.
+    """
+    cache_key = response_cache.make_key(request, TAG_TABLES)
+    unchanged = not_modified(request, response, cache_key)
+    if unchanged is not None:
+        return unchanged
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    filters = entry_filters(hobby_id, type_key, include_descendants=include_descendants)
+    tags = [
+        TagCount(tag=tag, count=count)
+        for tag, count in tag_counts(session, filters, prefix, limit)
+    ]
+    response_cache.set(cache_key, tags)
+    return tags
@@ -1,19 +1,44 @@
-from .common import ErrorResponse, PaginatedResponse
-from .entry import Entry, EntryCreate, EntryListItem, EntryUpdate
+from .common import ErrorResponse, FacetCount, PaginatedResponse
+from .entry import (
+    Entry,
+    EntryBatchCreate,
+    EntryBatchItem,
+    EntryBatchResult,
+    EntryBulkEdit,
+    EntryBulkEditResult,
+    EntryBulkFilter,
+    EntryCreate,
+    EntryDetail,
+    EntryHistogramBucket,
+    EntryListItem,
+    EntryUpdate,
+)
 from .entry_media import EntryMedia, EntryMediaCreate
 from .entry_prop import EntryProp, EntryPropBase, EntryPropBatch, EntryPropCreate
-from .hobby import Hobby, HobbyCreate, HobbyUpdate
+from .hobby import Hobby, HobbyCreate, HobbySummary, HobbyUpdate
 from .hobby_type import HobbyType, HobbyTypeCreate, HobbyTypeUpdate
-from .search import SearchRequest, SearchResult
+from .search import (
+    SearchRequest,
+    SearchResult,
+    SuggestResponse,
+    TermSuggestion,
+    TitleSuggestion,
+)
+from .tag import TagCount
 from .user import LoginRequest, User, UserCreate, UserUpdate
 
 __all__ = [
     "User", "UserCreate", "UserUpdate", "LoginRequest",
-    "Hobby", "HobbyCreate", "HobbyUpdate",
+    "Hobby", "HobbyCreate", "HobbyUpdate", "HobbySummary",
     "HobbyType", "HobbyTypeCreate", "HobbyTypeUpdate",
-    "Entry", "EntryCreate", "EntryUpdate", "EntryListItem",
+    "Entry", "EntryCreate", "EntryUpdate", "EntryListItem", "EntryDetail",
+    "EntryBatchItem", "EntryBatchCreate", "EntryBatchResult",
+    "EntryBulkFilter", "EntryBulkEdit", "EntryBulkEditResult",
+    "EntryHistogramBucket",
     "EntryMedia", "EntryMediaCreate",
     "EntryProp", "EntryPropBase", "EntryPropCreate", "EntryPropBatch",
     "SearchResult", "SearchRequest",
-    "ErrorResponse", "PaginatedResponse"
+    "SuggestResponse", "TermSuggestion", "TitleSuggestion",
+    "TagCount",
+    "ErrorResponse", "FacetCount", "PaginatedResponse"
 ]
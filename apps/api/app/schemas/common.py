@@ -12,9 +12,17 @@ class ErrorResponse(BaseModel):
     details: str | None = None
 
 
+class FacetCount(BaseModel):
+    value: int | str
+    count: int
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     items: list[T]
-    total: int
+    total: int | None
     limit: int
     offset: int
     has_more: bool
+    next_cursor: str | None = None
+    total_capped: bool = False
+    facets: dict[str, list[FacetCount]] | None = None
@@ -1,10 +1,12 @@
-from datetime import datetime
-from typing import Any
+from datetime import date, datetime
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
 from .entry_media import EntryMedia
-from .entry_prop import EntryProp
+from .entry_prop import EntryProp, EntryPropBase
+from .hobby import HobbySummary
+from .hobby_type import HobbyType
 
 
 class EntryBase(BaseModel):
@@ -19,6 +21,47 @@ class EntryCreate(EntryBase):
     pass
 
 
+class EntryBatchItem(EntryCreate):
+    props: list[EntryPropBase] = Field(default_factory=list)
+
+
+class EntryBatchCreate(BaseModel):
+    entries: list[EntryBatchItem] = Field(..., min_length=1, max_length=5000)
+
+
+class EntryBatchResult(BaseModel):
+    ids: list[int]
+
+
+class EntryBulkFilter(BaseModel):
+    q: str | None = None
+    hobby_id: int | None = None
+    type_key: str | None = None
+    tag: str | list[str] | None = None
+    match: Literal["all", "any"] = "all"
+    include_descendants: bool = False
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+
+class EntryBulkEdit(BaseModel):
+    filter: EntryBulkFilter = Field(default_factory=EntryBulkFilter)
+    operation: Literal["move_hobby", "add_tag", "remove_tag", "delete_prop"]
+    hobby_id: int | None = None
+    tag: str | None = None
+    key: str | None = None
+
+
+class EntryBulkEditResult(BaseModel):
+    matched: int
+    affected: int
+
+
+class EntryHistogramBucket(BaseModel):
+    bucket: date
+    count: int
+
+
 class EntryUpdate(BaseModel):
     title: str | None = None
     description: str | None = None
@@ -37,6 +80,7 @@ class EntryListItem(BaseModel):
     media_count: int = 0
     thumbnail_url: str | None = None
     props: dict[str, Any] = Field(default_factory=dict)
+    excerpt: str | None = None
 
     class Config:
         from_attributes = True
@@ -51,3 +95,8 @@ class Entry(EntryBase):
 
     class Config:
         from_attributes = True
+
+
+class EntryDetail(Entry):
+    hobby: HobbySummary | None = None
+    hobby_type: HobbyType | None = None
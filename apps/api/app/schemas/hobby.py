@@ -28,6 +28,18 @@ class HobbyUpdate(BaseModel):
     config_json: str | None = None
 
 
+class HobbySummary(BaseModel):
+    id: int
+    name: str
+    color: str | None = None
+    icon: str | None = None
+    parent_id: int | None = None
+    slug: str | None = None
+
+    class Config:
+        from_attributes = True
+
+
 class Hobby(HobbyBase):
     id: int
     children: list["Hobby"] = Field(default_factory=list)
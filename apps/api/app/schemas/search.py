@@ -14,3 +14,18 @@ class SearchRequest(BaseModel):
 class SearchResult(BaseModel):
     entry: EntryListItem
     rank: float
+
+
+class TermSuggestion(BaseModel):
+    term: str
+    count: int
+
+
+class TitleSuggestion(BaseModel):
+    id: int
+    title: str
+
+
+class SuggestResponse(BaseModel):
+    terms: list[TermSuggestion]
+    titles: list[TitleSuggestion]
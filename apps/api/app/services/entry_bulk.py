@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    Select,
+    Table,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.orm import Session
+
+from ..models import Entry, EntryProp, EntryTag
+
+BulkOperation = Literal["move_hobby", "add_tag", "remove_tag", "delete_prop"]
+
+# Per-connection scratch table holding the ids matched by a bulk edit, so
+# every statement of the edit sees the same set even when the edit changes
+# what the filters would match (e.g. removing the filtered tag)
+bulk_edit_ids = Table(
+    "bulk_edit_ids",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    prefixes=["TEMPORARY"],
+)
+
+# Rebuild entry.tags from entrytag rows in insertion order, the same
+# ", "-joined form the single-entry endpoints write
+_RETAG_SQL = """
+    UPDATE entry SET
+        tags = (SELECT group_concat(tag, ', ') FROM (
+            SELECT t.tag FROM entrytag t WHERE t.entry_id = entry.id ORDER BY t.id
+        )),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id IN (SELECT id FROM bulk_edit_ids)
+"""
+
+
+def bulk_edit_entries(
+    session: Session,
+    stmt: Select,
+    operation: BulkOperation,
+    *,
+    hobby_id: int | None = None,
+    tag: str | None = None,
+    key: str | None = None,
+) -> tuple[int, int]:
+    """Apply ``operation`` to every entry selected by ``stmt``.
+
+    ``stmt`` is a list or search statement from ``entry_query`` and ``tag``
+    an already normalized tag. Each
+    operation is a few set-based statements over the matched ids, so the
+    cost does not grow with one round trip per entry. Returns
+    ``(matched, affected)``, where affected counts entries moved, tags
+    added or removed, or props deleted. The caller commits.
+    """
+    bulk_edit_ids.create(session.connection(), checkfirst=True)
+    session.execute(delete(bulk_edit_ids))
+    matched = session.execute(
+        insert(bulk_edit_ids).from_select(
+            ["id"], stmt.with_only_columns(stmt.selected_columns.id)
+        )
+    ).rowcount
+    matched_ids = select(bulk_edit_ids.c.id)
+    has_tag = exists().where(
+        EntryTag.entry_id == bulk_edit_ids.c.id, EntryTag.tag == tag
+    )
+
+    if operation == "move_hobby":
+        affected = session.execute(
+            update(Entry)
+            .where(Entry.id.in_(matched_ids), Entry.hobby_id != hobby_id)
+            .values(hobby_id=hobby_id, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    elif operation == "add_tag":
+        # Narrow to entries lacking the tag, add it, then rewrite entry.tags
+        session.execute(delete(bulk_edit_ids).where(has_tag))
+        affected = session.execute(
+            insert(EntryTag).from_select(
+                ["entry_id", "tag"], select(bulk_edit_ids.c.id, literal(tag))
+            )
+        ).rowcount
+        session.execute(text(_RETAG_SQL))
+    elif operation == "remove_tag":
+        session.execute(delete(bulk_edit_ids).where(~has_tag))
+        affected = session.execute(
+            delete(EntryTag)
+            .where(EntryTag.entry_id.in_(matched_ids), EntryTag.tag == tag)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        session.execute(text(_RETAG_SQL))
+    else:
+        affected = session.execute(
+            delete(EntryProp)
+            .where(EntryProp.entry_id.in_(matched_ids), EntryProp.key == key)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+    session.execute(delete(bulk_edit_ids))
+    return matched, affected
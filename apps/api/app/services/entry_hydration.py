@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Collection, Mapping, Sequence
+from typing import Any
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+
+from ..models import Entry, EntryMedia, EntrySummary
+from ..schemas import (
+    EntryDetail,
+    EntryListItem,
+    HobbySummary,
+    HobbyType,
+)
+from ..schemas import (
+    EntryMedia as EntryMediaSchema,
+)
+from ..schemas import (
+    EntryProp as EntryPropSchema,
+)
+from .uploads import public_url
+
+# Source column for every EntryListItem field; summary fields need the
+# entry_summary join, the rest come from entry alone
+ENTRY_FIELDS = {
+    "id": Entry.id,
+    "hobby_id": Entry.hobby_id,
+    "type_key": Entry.type_key,
+    "title": Entry.title,
+    "description": Entry.description,
+    "tags": Entry.tags,
+    "created_at": Entry.created_at,
+    "updated_at": Entry.updated_at,
+}
+SUMMARY_FIELDS = {
+    "media_count": EntrySummary.media_count,
+    "thumbnail_url": EntrySummary.cover_path,
+    "props": EntrySummary.props_json,
+    "excerpt": EntrySummary.excerpt,
+}
+LIST_FIELDS = (*ENTRY_FIELDS, *SUMMARY_FIELDS)
+
+# Fields returned when ``fields=`` is not given; ``excerpt`` is opt-in
+DEFAULT_LIST_FIELDS = frozenset(LIST_FIELDS) - {"excerpt"}
+
+# Related records ``GET /entries/{id}`` can embed with ``include=``
+DETAIL_INCLUDES = ("hobby", "type")
+
+
+def parse_fields(fields: str | None) -> frozenset[str] | None:
+    """Parse a ``fields=id,title,...`` projection; ``id`` is always included."""
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(LIST_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field: {sorted(unknown)[0]}"
+        )
+    return frozenset(requested | {"id"})
+
+
+def _summary_value(field: str, value: Any) -> Any:
+    if field == "media_count":
+        return value or 0
+    if field == "thumbnail_url":
+        return public_url(value) if value else None
+    if field == "props":
+        return json.loads(value) if value else {}
+    return value
+
+
+def hydrate_entry_list_items(
+    session: Session,
+    ids: Sequence[int],
+    fields: Collection[str] | None = None,
+) -> list[EntryListItem]:
+    """Build ``EntryListItem``s for a page of entry ids, preserving ``ids`` order.
+
+    Media counts, thumbnails, props and excerpts come from the
+    trigger-maintained ``entry_summary`` table, so a page of any size is a
+    single join. With a ``fields`` projection only those columns are
+    selected, the summary join is skipped when no summary field is asked
+    for, and items are built unvalidated with just the requested fields.
+    """
+    if not ids:
+        return []
+    wanted = DEFAULT_LIST_FIELDS if fields is None else frozenset(fields) | {"id"}
+    entry_cols = [col.label(f) for f, col in ENTRY_FIELDS.items() if f in wanted]
+    summary_cols = [col.label(f) for f, col in SUMMARY_FIELDS.items() if f in wanted]
+
+    stmt = select(*entry_cols, *summary_cols).where(Entry.id.in_(ids))
+    if summary_cols:
+        stmt = stmt.outerjoin(EntrySummary, EntrySummary.entry_id == Entry.id)
+
+    by_id = {}
+    for row in session.execute(stmt).mappings():
+        data = {
+            f: _summary_value(f, v) if f in SUMMARY_FIELDS else v
+            for f, v in row.items()
+        }
+        if fields is None:
+            by_id[data["id"]] = EntryListItem(**data)
+        else:
+            by_id[data["id"]] = EntryListItem.model_construct(**data)
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def excluded_fields(fields: Collection[str] | None) -> set[str] | None:
+    """Item fields to leave out when serializing a ``fields`` projection."""
+    if fields is None:
+        return None
+    return set(LIST_FIELDS) - set(fields) - {"id"}
+
+
+def sparse_response(
+    response: BaseModel,
+    fields: Collection[str] | None,
+    headers: Mapping[str, str] | None = None,
+) -> Any:
+    """Serialize a list response keeping only the requested item ``fields``.
+
+    Sparse items would fail ``response_model`` validation, so they are
+    rendered directly as JSON with ``headers``.
+    """
+    if fields is None:
+        return response
+    excluded = excluded_fields(fields)
+    return JSONResponse(
+        response.model_dump(mode="json", exclude={"items": {"__all__": excluded}}),
+        headers=dict(headers or {}),
+    )
+
+
+def parse_include(include: str | None) -> frozenset[str]:
+    """Parse an ``include=hobby,type`` list of related records to embed."""
+    requested = {i.strip() for i in (include or "").split(",") if i.strip()}
+    unknown = requested - set(DETAIL_INCLUDES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include: {sorted(unknown)[0]}"
+        )
+    return frozenset(requested)
+
+
+def public_media(media: EntryMedia) -> EntryMediaSchema:
+    """``EntryMedia`` response with ``file_path`` mapped to its public URL."""
+    item = EntryMediaSchema.model_validate(media)
+    item.file_path = public_url(media.file_path)
+    return item
+
+
+def load_entry_detail(
+    session: Session,
+    entry_id: int,
+    include: Collection[str] = frozenset(),
+) -> EntryDetail | None:
+    """Load one entry with its media, props and requested related records.
+
+    Media and props come from one ``selectinload`` query each and the
+    hobby and type are joined into the entry query, so the detail costs at
+    most three queries; any other lazy load raises instead of running.
+    """
+    options = [selectinload(Entry.media), selectinload(Entry.props)]
+    if "hobby" in include:
+        options.append(joinedload(Entry.hobby))
+    if "type" in include:
+        options.append(joinedload(Entry.hobby_type))
+    entry = session.scalars(
+        select(Entry).where(Entry.id == entry_id).options(*options, raiseload("*"))
+    ).first()
+    if entry is None:
+        return None
+    detail = EntryDetail(
+        **{f: getattr(entry, f) for f in ENTRY_FIELDS},
+        media=[public_media(m) for m in entry.media],
+        props=[EntryPropSchema.model_validate(p) for p in entry.props],
+    )
+    if "hobby" in include:
+        detail.hobby = HobbySummary.model_validate(entry.hobby)
+    if "type" in include:
+        detail.hobby_type = HobbyType.model_validate(entry.hobby_type)
+    return detail
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import Any, Literal
+
+from sqlalchemy import (
+    Select,
+    String,
+    desc,
+    distinct,
+    exists,
+    func,
+    literal,
+    literal_column,
+    select,
+    text,
+    type_coerce,
+    union_all,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import TableClause, column, table
+
+from ..models import Entry, EntryTag, HobbyClosure
+from .search_ranking import Ranking
+from .tags import normalize_tags
+
+entry_fts = table("entry_fts", column("rowid"), column("rank"))
+entry_trigram = table("entry_trigram", column("rowid"), column("rank"))
+
+# Column positions in entry_fts and entry_trigram for highlight()/snippet()
+FTS_TITLE_COLUMN = 0
+FTS_DESCRIPTION_COLUMN = 1
+
+FACET_FIELDS = ("hobby_id", "type_key", "tag")
+FACET_LIMIT = 20
+
+TagMatch = Literal["all", "any"]
+
+HistogramBucket = Literal["day", "week", "month"]
+
+# Start of the bucket holding a timestamp, as YYYY-MM-DD text; weeks start
+# on Monday
+HISTOGRAM_BUCKETS = {
+    "day": lambda ts: func.date(ts),
+    "week": lambda ts: func.date(ts, "weekday 0", "-6 days"),
+    "month": lambda ts: func.strftime("%Y-%m-01", ts),
+}
+
+
+def entry_filters(
+    hobby_id: int | None = None,
+    type_key: str | None = None,
+    tag: str | Sequence[str] | None = None,
+    include_descendants: bool = False,
+    match: TagMatch = "all",
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> list[Any]:
+    """Build WHERE clauses on ``entry`` shared by list and search endpoints.
+
+    ``tag`` may name several tags (a list and/or comma-separated); entries
+    must carry all of them, or any of them with ``match="any"``. Several
+    tags are resolved as one grouped pass over the ``(tag, entry_id)``
+    index, ``HAVING COUNT(DISTINCT tag) = n`` for "all".
+
+    ``created_from``/``created_to`` bound ``created_at`` to the half-open
+    range ``[created_from, created_to)``, compared on the stored text so
+    the ``(hobby_id, created_at)`` index applies.
+    """
+    clauses: list[Any] = []
+    if hobby_id:
+        if include_descendants:
+            clauses.append(
+                Entry.hobby_id.in_(
+                    select(HobbyClosure.descendant_id).where(
+                        HobbyClosure.ancestor_id == hobby_id
+                    )
+                )
+            )
+        else:
+            clauses.append(Entry.hobby_id == hobby_id)
+    if type_key:
+        clauses.append(Entry.type_key == type_key)
+    tags = normalize_tags(tag if tag is None or isinstance(tag, str) else ",".join(tag))
+    if len(tags) == 1:
+        clauses.append(
+            exists().where(EntryTag.entry_id == Entry.id, EntryTag.tag == tags[0])
+        )
+    elif tags:
+        tagged = select(EntryTag.entry_id).where(EntryTag.tag.in_(tags))
+        if match == "all":
+            tagged = tagged.group_by(EntryTag.entry_id).having(
+                func.count(distinct(EntryTag.tag)) == len(tags)
+            )
+        clauses.append(Entry.id.in_(tagged))
+    created_key = type_coerce(Entry.created_at, String)
+    if created_from:
+        clauses.append(created_key >= _timestamp_text(created_from))
+    if created_to:
+        clauses.append(created_key < _timestamp_text(created_to))
+    return clauses
+
+
+def _timestamp_text(value: datetime) -> str:
+    """``value`` in the naive UTC text form ``created_at`` is stored in."""
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return value.isoformat(sep=" ")
+
+
+def list_stmt(filters: list[Any]) -> Select:
+    """Select matching entry ids keyed by ``created_at`` (newest first).
+
+    The sort key is the stored ``created_at`` text, so keyset comparisons
+    match ORDER BY exactly whatever timestamp format a row was written in.
+    """
+    created_key = type_coerce(Entry.created_at, String)
+    return select(Entry.id.label("id"), created_key.label("sort_key")).where(*filters)
+
+
+def fts_stmt(
+    query: str, filters: list[Any], ranking: Ranking | None = None
+) -> Select:
+    """Select entry ids matching an FTS5 query keyed by BM25 rank (lower is better).
+
+    Uses the ``rank`` column rather than ``bm25()`` because auxiliary
+    functions cannot be evaluated inside the windowed subquery of
+    ``fetch_page``; ``rank`` defaults to ``bm25(entry_fts)`` and per-column
+    weights are applied with a ``rank MATCH 'bm25(...)'`` constraint.
+
+    With a recency half-life the score is divided by ``1 + age / half_life``,
+    so a hit ``half_life`` days old counts half as much as a new one. Ages
+    are measured from ``ranking.now`` when set, else from the current time.
+    """
+    ranking = ranking or Ranking()
+    where = [text("entry_fts MATCH :query").bindparams(query=query), *filters]
+    bm25 = ranking.bm25()
+    if bm25:
+        where.append(text("entry_fts.rank MATCH :bm25").bindparams(bm25=bm25))
+
+    sort_key = entry_fts.c.rank
+    if ranking.half_life_days:
+        now = func.julianday("now") if ranking.now is None else literal(ranking.now)
+        age_days = now - func.julianday(Entry.created_at)
+        sort_key = sort_key / (1 + func.max(age_days, 0.0) / ranking.half_life_days)
+
+    return (
+        select(Entry.id.label("id"), sort_key.label("sort_key"))
+        .join(entry_fts, entry_fts.c.rowid == Entry.id)
+        .where(*where)
+    )
+
+
+def substring_query(fragment: str) -> str:
+    """Quote a raw fragment as a single trigram phrase, e.g. ``"70-200"``."""
+    return '"' + fragment.replace('"', '""') + '"'
+
+
+def substring_stmt(fragment: str, filters: list[Any]) -> Select:
+    """Select entry ids whose title, description or tags contain ``fragment``.
+
+    Served from the trigram index, so punctuation inside model numbers,
+    ISBNs and URLs is matched literally and case-insensitively.
+    """
+    match = text("entry_trigram MATCH :query").bindparams(
+        query=substring_query(fragment)
+    )
+    return (
+        select(Entry.id.label("id"), entry_trigram.c.rank.label("sort_key"))
+        .join(entry_trigram, entry_trigram.c.rowid == Entry.id)
+        .where(match, *filters)
+    )
+
+
+def histogram_stmt(stmt: Select, bucket: HistogramBucket) -> Select:
+    """Count the entries matched by a list or search statement per ``bucket``.
+
+    Rows are ``(bucket, count)`` in date order, ``bucket`` being the first
+    day of the period; periods without entries are omitted.
+    """
+    start = HISTOGRAM_BUCKETS[bucket](Entry.created_at)
+    return (
+        stmt.with_only_columns(start.label("bucket"), func.count().label("count"))
+        .group_by(start)
+        .order_by(start)
+    )
+
+
+def fts_highlights(
+    session: Session,
+    query: str,
+    ids: Sequence[int],
+    *,
+    start: str,
+    end: str,
+    tokens: int,
+    index: TableClause = entry_fts,
+) -> dict[int, tuple[str | None, str | None]]:
+    """Return ``{id: (highlighted title, description snippet)}`` for a page of hits.
+
+    Auxiliary functions cannot run inside the windowed subquery of
+    ``fetch_page``, so they are evaluated here against the page ids only.
+    ``index`` is the FTS table the page was matched against.
+    """
+    if not ids:
+        return {}
+    fts = literal_column(index.name)
+    rows = session.execute(
+        select(
+            index.c.rowid,
+            func.highlight(fts, FTS_TITLE_COLUMN, start, end),
+            func.snippet(fts, FTS_DESCRIPTION_COLUMN, start, end, "…", tokens),
+        )
+        .select_from(index)
+        .where(
+            text(f"{index.name} MATCH :query").bindparams(query=query),
+            index.c.rowid.in_(ids),
+        )
+    ).all()
+    return {rowid: (title, snippet) for rowid, title, snippet in rows}
+
+
+def facet_counts(
+    session: Session, stmt: Select, limit: int = FACET_LIMIT
+) -> dict[str, list[dict[str, Any]]]:
+    """Count matches per ``hobby_id``, ``type_key`` and tag for a list/search stmt.
+
+    The matched ids are materialized once in a CTE and every facet is a
+    grouped aggregate over it, combined with UNION ALL so all facets come
+    back in a single round trip. Each facet keeps its ``limit`` most
+    frequent values.
+    """
+    matched = (
+        stmt.with_only_columns(stmt.selected_columns.id)
+        .cte("matched")
+        .prefix_with("MATERIALIZED")
+    )
+    matched_ids = select(matched.c.id)
+
+    def top(facet: str, value: Any, count: Any, source: Any, entry_id: Any) -> Select:
+        grouped = (
+            select(
+                literal(facet).label("facet"),
+                value.label("value"),
+                count.label("count"),
+            )
+            .select_from(source)
+            .where(entry_id.in_(matched_ids), value.is_not(None))
+            .group_by(value)
+            .order_by(desc("count"), value)
+            .limit(limit)
+            .subquery()
+        )
+        return select(grouped)
+
+    rows = session.execute(union_all(
+        top("hobby_id", Entry.hobby_id, func.count(), Entry, Entry.id),
+        top("type_key", Entry.type_key, func.count(), Entry, Entry.id),
+        top(
+            "tag", EntryTag.tag, func.count(distinct(EntryTag.entry_id)),
+            EntryTag, EntryTag.entry_id,
+        ),
+    ).order_by("facet", desc("count"), "value")).all()
+
+    facets: dict[str, list[dict[str, Any]]] = {f: [] for f in FACET_FIELDS}
+    for facet, value, count in rows:
+        facets[facet].append({"value": value, "count": count})
+    return facets
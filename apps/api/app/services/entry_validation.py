@@ -1,9 +1,12 @@
 import json
 from typing import Any
 
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import SchemaError, best_match
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from ..models import HobbyType
+from ..models import Hobby, HobbyType
 from ..schemas import EntryPropBase
 from .schema_validation import validate_props
 
@@ -33,7 +36,19 @@ def validate_entry_props(
             "errors": ["Invalid JSON schema for hobby type"]
         }
 
-    # Convert props to a dictionary for validation
+    # Validate against schema using Draft 2020-12
+    try:
+        validate_props(hobby_type.schema_json, props_to_dict(props))
+        return {"valid": True, "errors": []}
+    except Exception as e:
+        return {
+            "valid": False,
+            "errors": [str(e)]
+        }
+
+
+def props_to_dict(props: list[EntryPropBase]) -> dict[str, Any]:
+    """Convert props to a dictionary for validation"""
     props_dict = {}
     for prop in props:
         if prop.value_text is not None:
@@ -43,13 +58,55 @@ def validate_entry_props(
             except json.JSONDecodeError:
                 # If not JSON, treat as string
                 props_dict[prop.key] = prop.value_text
+    return props_dict
 
-    # Validate against schema using Draft 2020-12
-    try:
-        validate_props(hobby_type.schema_json, props_dict)
-        return {"valid": True, "errors": []}
-    except Exception as e:
-        return {
-            "valid": False,
-            "errors": [str(e)]
-        }
+
+def validate_entries_batch(
+    session: Session,
+    entries: list[tuple[int, str, list[EntryPropBase]]]
+) -> dict[str, Any]:
+    """
+    Validate ``(hobby_id, type_key, props)`` triples for a bulk insert.
+    Hobbies and hobby types are loaded once and each type's schema is
+    compiled once, however many entries share it. Props are only checked
+    against the schema when given, as in the single-entry endpoints.
+    """
+    hobby_ids = {hobby_id for hobby_id, _, _ in entries}
+    known_hobbies = set(
+        session.scalars(select(Hobby.id).where(Hobby.id.in_(hobby_ids)))
+    )
+    type_keys = {type_key for _, type_key, _ in entries}
+    schemas = dict(session.execute(
+        select(HobbyType.key, HobbyType.schema_json).where(HobbyType.key.in_(type_keys))
+    ).tuples().all())
+
+    validators: dict[str, Draft202012Validator] = {}
+    invalid_schemas = set()
+    for key, schema_json in schemas.items():
+        try:
+            schema = json.loads(schema_json)
+            Draft202012Validator.check_schema(schema)
+            validators[key] = Draft202012Validator(schema)
+        except (json.JSONDecodeError, SchemaError):
+            invalid_schemas.add(key)
+
+    errors = []
+    for i, (hobby_id, type_key, props) in enumerate(entries):
+        if hobby_id not in known_hobbies:
+            errors.append(f"entries[{i}]: Hobby {hobby_id} not found")
+        if type_key not in schemas:
+            errors.append(f"entries[{i}]: Hobby type '{type_key}' not found")
+            continue
+        keys = [prop.key for prop in props]
+        if len(keys) != len(set(keys)):
+            errors.append(f"entries[{i}]: Duplicate property keys")
+        if not props:
+            continue
+        if type_key in invalid_schemas:
+            errors.append(f"entries[{i}]: Invalid JSON schema for hobby type")
+            continue
+        error = best_match(validators[type_key].iter_errors(props_to_dict(props)))
+        if error is not None:
+            errors.append(f"entries[{i}]: {error.message}")
+
+    return {"valid": not errors, "errors": errors}
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Sequence
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..models import EntryProp, EntryTag
+from ..schemas import EntryPropBase
+from .prop_index import prop_value_num
+
+
+def entry_prop_rows(
+    entry_id: int, props: Sequence[EntryPropBase], numeric_keys: Collection[str]
+) -> list[dict]:
+    """``entryprop`` rows for ``props``, with ``value_num`` for typed keys."""
+    return [
+        {
+            "entry_id": entry_id,
+            "key": prop.key,
+            "value_text": prop.value_text,
+            "value_num": (
+                prop_value_num(prop.value_text) if prop.key in numeric_keys else None
+            ),
+        }
+        for prop in props
+    ]
+
+
+def sync_entry_tags(session: Session, entry_id: int, tags: Sequence[str]) -> None:
+    """Make the entry's ``entrytag`` rows match ``tags`` (already normalized).
+
+    Only removed tags are deleted and only new ones inserted, so unchanged
+    tags cause no writes or trigger work. The caller commits.
+    """
+    existing = set(
+        session.scalars(select(EntryTag.tag).where(EntryTag.entry_id == entry_id))
+    )
+    removed = existing.difference(tags)
+    added = [t for t in tags if t not in existing]
+    if removed:
+        session.execute(
+            delete(EntryTag)
+            .where(EntryTag.entry_id == entry_id, EntryTag.tag.in_(removed))
+            .execution_options(synchronize_session=False)
+        )
+    if added:
+        session.execute(
+            insert(EntryTag), [{"entry_id": entry_id, "tag": t} for t in added]
+        )
+
+
+def sync_entry_props(
+    session: Session, entry_id: int, rows: Sequence[dict]
+) -> list[EntryProp]:
+    """Make the entry's props match ``rows`` (from ``entry_prop_rows``).
+
+    Props whose key is gone are deleted; new or changed ones are written
+    with one ``INSERT ... ON CONFLICT (entry_id, key) DO UPDATE ...
+    RETURNING`` and unchanged ones are left alone. Returns the props in
+    ``rows`` order. The caller commits.
+    """
+    current = session.scalars(select(EntryProp).where(EntryProp.entry_id == entry_id))
+    existing = {prop.key: prop for prop in current}
+    keys = {row["key"] for row in rows}
+    stale = set(existing) - keys
+    if stale:
+        session.execute(
+            delete(EntryProp)
+            .where(EntryProp.entry_id == entry_id, EntryProp.key.in_(stale))
+            .execution_options(synchronize_session=False)
+        )
+
+    changed = [
+        row for row in rows
+        if row["key"] not in existing
+        or existing[row["key"]].value_text != row["value_text"]
+        or existing[row["key"]].value_num != row["value_num"]
+    ]
+    by_key = dict(existing)
+    if changed:
+        upsert = sqlite_insert(EntryProp)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[EntryProp.entry_id, EntryProp.key],
+            set_={
+                "value_text": upsert.excluded.value_text,
+                "value_num": upsert.excluded.value_num,
+            },
+        )
+        written = session.scalars(
+            upsert.returning(EntryProp).execution_options(populate_existing=True),
+            changed,
+        )
+        by_key.update((prop.key, prop) for prop in written)
+    return [by_key[row["key"]] for row in rows]
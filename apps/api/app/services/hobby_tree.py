@@ -28,26 +28,66 @@ def ensure_unique_slug(session: Session, base: str, exclude_id: int | None = Non
         slug = f"{base}-{n}"
 
 
-def get_hobby_tree(session: Session) -> list[dict[str, Any]]:
+def load_hobbies(session: Session) -> dict[int | None, list[Hobby]]:
+    """Every hobby in one query, grouped by ``parent_id``.
+
+    Each group is ordered by ``sort_order`` then ``id``. Nesting from these
+    groups instead of the lazy ``children`` relationship keeps building a
+    subtree to this single query.
+    """
     hobbies = session.query(Hobby).order_by(Hobby.sort_order, Hobby.id).all()
     by_parent: dict[int | None, list[Hobby]] = {}
     for h in hobbies:
         by_parent.setdefault(h.parent_id, []).append(h)
+    return by_parent
+
+
+def hobby_node(
+    h: Hobby,
+    by_parent: dict[int | None, list[Hobby]],
+    depth: int | None = None,
+) -> dict[str, Any]:
+    """``Hobby`` response for ``h`` with children from ``load_hobbies``.
+
+    ``depth`` caps how many levels of children are nested (``0`` returns
+    none); ``None`` returns the whole subtree.
+    """
+    if depth is None or depth > 0:
+        below = None if depth is None else depth - 1
+        children = [hobby_node(ch, by_parent, below) for ch in by_parent.get(h.id, [])]
+    else:
+        children = []
+    return {
+        "id": h.id,
+        "name": h.name,
+        "slug": h.slug,
+        "color": h.color,
+        "icon": h.icon,
+        "parent_id": h.parent_id,
+        "description": h.description,
+        "sort_order": h.sort_order,
+        "config_json": h.config_json,
+        "children": children,
+    }
+
+
+def get_hobby_subtree(
+    session: Session, hobby_id: int, depth: int | None = None
+) -> dict[str, Any] | None:
+    """One hobby with its nested children, or ``None`` if it does not exist."""
+    by_parent = load_hobbies(session)
+    for siblings in by_parent.values():
+        for h in siblings:
+            if h.id == hobby_id:
+                return hobby_node(h, by_parent, depth)
+    return None
 
-    def node(h: Hobby) -> dict[str, Any]:
-        return {
-            "id": h.id,
-            "name": h.name,
-            "slug": h.slug,
-            "color": h.color,
-            "icon": h.icon,
-            "sort_order": h.sort_order,
-            "children": [node(ch) for ch in by_parent.get(h.id, [])],
-        }
-
-    roots = by_parent.get(None, [])
-    # Sort children lists by sort_order
-    for lst in by_parent.values():
-        lst.sort(key=lambda x: (x.sort_order, x.id))
-    return [node(r) for r in roots]
 
+def get_hobby_tree(
+    session: Session,
+    parent_id: int | None = None,
+    depth: int | None = None,
+) -> list[dict[str, Any]]:
+    """Children of ``parent_id`` (roots when ``None``) with nested subtrees."""
+    by_parent = load_hobbies(session)
+    return [hobby_node(h, by_parent, depth) for h in by_parent.get(parent_id, [])]
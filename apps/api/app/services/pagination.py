@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, func, or_, select
+from sqlalchemy.orm import Session
+
+CountMode = Literal["exact", "estimate", "none"]
+
+# Upper bound for count=estimate; larger result sets report "1000+"
+COUNT_ESTIMATE_CAP = 1000
+
+
+@dataclass
+class Page:
+    ids: list[int]
+    total: int | None
+    total_capped: bool
+    has_more: bool
+    next_cursor: str | None
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode a keyset position as an opaque, URL-safe token."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: tuple[type, ...]) -> list[Any]:
+    """Decode a token produced by ``encode_cursor``.
+
+    ``types`` gives the expected type of each position; a 400 error is
+    raised if the token is malformed or does not match them.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        ) from e
+    if (
+        not isinstance(values, list)
+        or len(values) != len(types)
+        or not all(isinstance(v, t) for v, t in zip(values, types, strict=True))
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return values
+
+
+def cursor_anchor(cursor: str | None, sort_type: type) -> float | None:
+    """Anchor stored in a cursor by ``fetch_page(anchor=...)``, if any."""
+    if not cursor:
+        return None
+    return decode_cursor(cursor, (sort_type, int, float))[2]
+
+
+def fetch_page(
+    session: Session,
+    stmt: Select,
+    *,
+    sort_desc: bool,
+    sort_type: type,
+    limit: int,
+    offset: int = 0,
+    cursor: str | None = None,
+    count: CountMode = "exact",
+    anchor: float | None = None,
+) -> Page:
+    """Fetch one page of ids from ``stmt`` ordered by ``(sort_key, id DESC)``.
+
+    ``stmt`` must select ``id`` and ``sort_key`` columns. One extra row is
+    fetched to decide ``has_more``, so it is correct whatever ``count`` is.
+    With ``count="exact"`` the total comes from a window function in the
+    same statement; ``"estimate"`` counts at most ``COUNT_ESTIMATE_CAP + 1``
+    rows; ``"none"`` skips counting.
+
+    ``anchor`` is carried in ``next_cursor`` next to the position, for sort
+    keys that depend on a value fixed when the first page was fetched; read
+    it back with ``cursor_anchor`` to rebuild ``stmt`` for the next page.
+    """
+    matches = stmt
+    if count == "exact":
+        matches = stmt.add_columns(func.count().over().label("total"))
+    inner = matches.subquery()
+    sort_col = inner.c.sort_key
+    page_stmt = select(inner).order_by(
+        sort_col.desc() if sort_desc else sort_col.asc(), inner.c.id.desc()
+    )
+    if cursor:
+        types = (sort_type, int) if anchor is None else (sort_type, int, float)
+        after_key, after_id = decode_cursor(cursor, types)[:2]
+        beyond = sort_col < after_key if sort_desc else sort_col > after_key
+        page_stmt = page_stmt.where(
+            or_(beyond, and_(sort_col == after_key, inner.c.id < after_id))
+        )
+
+    rows = session.execute(page_stmt.offset(offset).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more:
+        position = (rows[-1].sort_key, rows[-1].id)
+        next_cursor = encode_cursor(
+            *position, *(() if anchor is None else (anchor,))
+        )
+
+    total: int | None = None
+    total_capped = False
+    if count == "exact":
+        if rows:
+            total = rows[0].total
+        elif offset or cursor:
+            # Past the last page: the window function saw no rows
+            total = session.execute(
+                select(func.count()).select_from(stmt.subquery())
+            ).scalar_one()
+        else:
+            total = 0
+    elif count == "estimate":
+        total = session.execute(
+            select(func.count()).select_from(
+                stmt.limit(COUNT_ESTIMATE_CAP + 1).subquery()
+            )
+        ).scalar_one()
+        if total > COUNT_ESTIMATE_CAP:
+            total = COUNT_ESTIMATE_CAP
+            total_capped = True
+
+    return Page(
+        ids=[row.id for row in rows],
+        total=total,
+        total_capped=total_capped,
+        has_more=has_more,
+        next_cursor=next_cursor,
+    )
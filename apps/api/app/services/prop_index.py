@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+from collections.abc import Iterable
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, func, literal, not_, or_, select, update
+from sqlalchemy.orm import Session, aliased
+
+from ..models import Entry, EntryProp, HobbyType
+
+# JSON Schema property types whose values are indexed in entryprop.value_num;
+# booleans are stored as 1/0
+NUMERIC_TYPES = frozenset({"number", "integer", "boolean"})
+
+PROP_OPS = {
+    "eq": lambda col, v: col == v,
+    "ne": lambda col, v: col != v,
+    "gt": lambda col, v: col > v,
+    "gte": lambda col, v: col >= v,
+    "lt": lambda col, v: col < v,
+    "lte": lambda col, v: col <= v,
+}
+
+_PROP_PARAM = re.compile(r"^prop\.(?P<key>[^\[\]]+)(?:\[(?P<op>\w+)\])?$")
+_PROP_SORT = re.compile(r"^(?P<desc>-)?prop\.(?P<key>[^\[\]]+)$")
+
+
+def _invalid(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def numeric_prop_keys(schema_json: str | None) -> frozenset[str]:
+    """Keys a hobby type schema declares as number, integer or boolean."""
+    try:
+        properties = json.loads(schema_json or "{}").get("properties") or {}
+    except (ValueError, AttributeError):
+        return frozenset()
+    keys = set()
+    for key, definition in properties.items():
+        types = definition.get("type") if isinstance(definition, dict) else None
+        if isinstance(types, str):
+            types = [types]
+        if isinstance(types, list) and NUMERIC_TYPES.intersection(types):
+            keys.add(key)
+    return frozenset(keys)
+
+
+def numeric_prop_keys_by_type(
+    session: Session, type_keys: Iterable[str]
+) -> dict[str, frozenset[str]]:
+    """``numeric_prop_keys`` for several hobby types in one query."""
+    rows = session.execute(
+        select(HobbyType.key, HobbyType.schema_json)
+        .where(HobbyType.key.in_(set(type_keys)))
+    ).tuples()
+    return {key: numeric_prop_keys(schema_json) for key, schema_json in rows}
+
+
+def prop_value_num(value_text: str | None) -> float | None:
+    """Numeric form of a stored prop value, or ``None`` if it has none."""
+    if value_text is None:
+        return None
+    try:
+        value = json.loads(value_text)
+    except ValueError:
+        return None
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, int | float) and math.isfinite(value):
+        return float(value)
+    return None
+
+
+def reindex_prop_values(session: Session, type_key: str) -> None:
+    """Recompute ``value_num`` for every prop of entries of ``type_key``.
+
+    Run after the type's schema changes; the caller commits.
+    """
+    schema_json = session.scalar(
+        select(HobbyType.schema_json).where(HobbyType.key == type_key)
+    )
+    numeric = numeric_prop_keys(schema_json)
+    rows = session.execute(
+        select(EntryProp.id, EntryProp.key, EntryProp.value_text)
+        .join(Entry, Entry.id == EntryProp.entry_id)
+        .where(Entry.type_key == type_key)
+    ).all()
+    if rows:
+        session.execute(update(EntryProp), [
+            {
+                "id": row.id,
+                "value_num": (
+                    prop_value_num(row.value_text) if row.key in numeric else None
+                ),
+            }
+            for row in rows
+        ])
+
+
+def _filter_number(raw: str) -> float | None:
+    if raw.lower() in ("true", "false"):
+        return float(raw.lower() == "true")
+    try:
+        value = float(raw)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _prop_equals(raw: str, number: float | None) -> Any:
+    """Null-safe ``entryprop`` match of a filter value for ``eq``/``ne``.
+
+    Props are stored either as plain text or JSON-encoded (a string prop
+    holding ``50`` is stored as ``"50"``), so both spellings of ``raw`` are
+    compared against ``value_text``, and a numeric ``raw`` also matches
+    ``value_num`` of typed props.
+    """
+    texts = {raw, json.dumps(raw)}
+    clause = and_(
+        EntryProp.value_text.is_not(None), EntryProp.value_text.in_(texts)
+    )
+    if number is not None:
+        clause = or_(EntryProp.value_num.is_not_distinct_from(number), clause)
+    return clause
+
+
+def prop_filters(query_params: Any) -> list[Any]:
+    """Build WHERE clauses on ``entry`` from ``prop.<key>[op]=value`` params.
+
+    ``query_params`` is the request's ``QueryParams``; other params are
+    ignored. ``op`` is one of ``PROP_OPS`` (``eq`` when omitted). ``eq``
+    and ``ne`` match the stored text, plain or JSON-encoded, and the
+    indexed number when the value is one; range operators need a number.
+    Each clause is an ``IN`` over the ``(key, value_num, entry_id)`` index.
+    """
+    clauses = []
+    for param, raw in query_params.multi_items():
+        if not param.startswith("prop."):
+            continue
+        match = _PROP_PARAM.match(param)
+        if not match:
+            raise _invalid(f"Invalid prop filter: {param}")
+        key, op = match["key"], match["op"] or "eq"
+        if op not in PROP_OPS:
+            raise _invalid(
+                f"Unknown operator in {param}; use one of {', '.join(PROP_OPS)}"
+            )
+        number = _filter_number(raw)
+        if op in ("eq", "ne"):
+            condition = _prop_equals(raw, number)
+            if op == "ne":
+                condition = not_(condition)
+        elif number is None:
+            raise _invalid(f"Invalid number for {param}: {raw}")
+        else:
+            condition = PROP_OPS[op](EntryProp.value_num, number)
+        clauses.append(
+            Entry.id.in_(
+                select(EntryProp.entry_id).where(EntryProp.key == key, condition)
+            )
+        )
+    return clauses
+
+
+def prop_sort(stmt: Select, sort: str) -> tuple[Select, bool]:
+    """Re-key a list or search statement on a numeric prop.
+
+    ``sort`` is ``prop.<key>`` (ascending) or ``-prop.<key>``. Returns the
+    statement with ``sort_key`` replaced and whether it sorts descending.
+    Entries without a numeric value sort last either way.
+    """
+    match = _PROP_SORT.match(sort)
+    if not match:
+        raise _invalid(f"Invalid sort: {sort}; use prop.<key> or -prop.<key>")
+    descending = bool(match["desc"])
+    prop = aliased(EntryProp)
+    missing = literal(float("-inf") if descending else float("inf"))
+    stmt = stmt.with_only_columns(
+        stmt.selected_columns.id,
+        func.coalesce(prop.value_num, missing).label("sort_key"),
+    ).outerjoin(prop, and_(prop.entry_id == Entry.id, prop.key == match["key"]))
+    return stmt, descending
+
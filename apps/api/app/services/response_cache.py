@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.sql.dml import UpdateBase
+
+# Tables each cached read depends on; a committed write to any of them
+# invalidates the cached responses
+ENTRY_LIST_TABLES = (
+    "entry", "entrymedia", "entryprop", "entrytag", "entry_summary",
+    "hobby", "hobby_closure",
+)
+ENTRY_DETAIL_TABLES = ("entry", "entrymedia", "entryprop")
+HOBBY_TABLES = ("hobby",)
+TAG_TABLES = ("entry", "entrytag", "hobby")
+HOBBY_TYPE_TABLES = ("hobbytype",)
+
+_DML_TABLE = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)"
+    r"\s+[\"`\[]?(\w+)",
+    re.IGNORECASE,
+)
+
+_PENDING_KEY = "response_cache_pending_tables"
+
+
+class ResponseCache:
+    """In-process LRU cache for read endpoint responses.
+
+    Keys carry the write generation of every table the response depends on,
+    so a committed write makes older entries unreachable; they then age out
+    through the LRU size bound or the TTL.
+    """
+
+    def __init__(self, max_size: int = 256, ttl: float = 60.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Generations restart at zero with the process; the epoch keeps
+        # ETags issued by an earlier process from matching
+        self.epoch = os.urandom(8).hex()
+
+    def generation(self, tables: Iterable[str]) -> tuple[int, ...]:
+        with self._lock:
+            return tuple(self._generations.get(t, 0) for t in tables)
+
+    def bump(self, tables: Iterable[str]) -> None:
+        with self._lock:
+            for t in tables:
+                self._generations[t] = self._generations.get(t, 0) + 1
+
+    def make_key(self, request: Request, tables: Iterable[str]) -> tuple:
+        """Key on route path, sorted query params and table generations."""
+        params = tuple(sorted(request.query_params.multi_items()))
+        return (request.url.path, params, self.generation(tables))
+
+    def etag(self, key: tuple) -> str:
+        """Strong ETag for a cache key; it changes whenever the key does."""
+        digest = hashlib.sha256(repr((self.epoch, key)).encode()).hexdigest()
+        return f'"{digest[:32]}"'
+
+    def get(self, key: tuple) -> Any | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: tuple, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+response_cache = ResponseCache(
+    max_size=int(os.getenv("RESPONSE_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "60")),
+)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in (t.removeprefix("W/") for t in tags)
+
+
+def not_modified(request: Request, response: Response, key: tuple) -> Response | None:
+    """Set ETag headers for ``key`` and short-circuit conditional GETs.
+
+    Returns a ``304 Not Modified`` when ``If-None-Match`` already holds the
+    current ETag, otherwise ``None`` with the headers set on ``response``.
+    """
+    headers = {"ETag": response_cache.etag(key), "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def _pending(session: Session) -> set[str]:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, flush_context: Any) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            _pending(session).add(table)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_execute(state: ORMExecuteState) -> None:
+    statement = state.statement
+    if isinstance(statement, UpdateBase):
+        _pending(state.session).add(statement.table.name)
+        return
+    match = _DML_TABLE.match(getattr(statement, "text", "") or "")
+    if match:
+        _pending(state.session).add(match.group(1).lower())
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_generations(session: Session) -> None:
+    tables = session.info.pop(_PENDING_KEY, None)
+    if tables:
+        response_cache.bump(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import math
+import time
+from dataclasses import dataclass
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from ..db.fts import FTS_COLUMNS
+from ..models import Hobby
+
+
+@dataclass
+class Ranking:
+    """BM25 column weights (in ``FTS_COLUMNS`` order) and recency half-life in days.
+
+    ``now`` is the Julian day ages are measured from; it is fixed for a
+    paged listing so every page ranks hits the same way.
+    """
+
+    weights: tuple[float, ...] | None = None
+    half_life_days: float | None = None
+    now: float | None = None
+
+    def bm25(self) -> str | None:
+        """Render the weights as an FTS5 ``rank`` function, e.g. ``bm25(10.0, 1.0)``."""
+        if self.weights is None:
+            return None
+        return f"bm25({', '.join(repr(w) for w in self.weights)})"
+
+
+def julian_day_now() -> float:
+    """Current UTC time as a Julian day, like SQLite's ``julianday('now')``."""
+    return time.time() / 86400 + 2440587.5
+
+
+def _invalid(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def _weights_from_mapping(weights: dict[str, object]) -> tuple[float, ...]:
+    unknown = set(weights) - set(FTS_COLUMNS)
+    if unknown:
+        raise _invalid(f"Unknown weight column: {sorted(unknown)[0]}")
+    values = []
+    for col in FTS_COLUMNS:
+        value = weights.get(col, 1.0)
+        if isinstance(value, bool) or not isinstance(value, int | float):
+            raise _invalid(f"Weight for {col} must be a number")
+        if not math.isfinite(value) or value < 0:
+            raise _invalid(f"Weight for {col} must be a non-negative number")
+        values.append(float(value))
+    return tuple(values)
+
+
+def parse_weights(spec: str) -> tuple[float, ...]:
+    """Parse ``title:10,tags:5`` into BM25 weights; unnamed columns weigh 1."""
+    weights: dict[str, object] = {}
+    for part in (p.strip() for p in spec.split(",")):
+        if not part:
+            continue
+        col, sep, value = part.partition(":")
+        if not sep:
+            raise _invalid(f"Invalid weight: {part}")
+        try:
+            weights[col.strip()] = float(value)
+        except ValueError as e:
+            raise _invalid(f"Invalid weight: {part}") from e
+    return _weights_from_mapping(weights)
+
+
+def hobby_ranking(session: Session, hobby_id: int | None) -> Ranking:
+    """Read ranking defaults from ``Hobby.config_json``.
+
+    Expected shape::
+
+        {"search": {"weights": {"title": 10, "tags": 5},
+                    "recency_half_life_days": 90}}
+
+    Missing or malformed config falls back to unweighted BM25.
+    """
+    if not hobby_id:
+        return Ranking()
+    config_json = session.query(Hobby.config_json).filter(Hobby.id == hobby_id).scalar()
+    try:
+        config = json.loads(config_json) if config_json else {}
+        search = config.get("search") or {}
+        weights = search.get("weights")
+        half_life = search.get("recency_half_life_days")
+        return Ranking(
+            weights=_weights_from_mapping(weights) if weights else None,
+            half_life_days=float(half_life) if half_life and half_life > 0 else None,
+        )
+    except (ValueError, TypeError, AttributeError, HTTPException):
+        return Ranking()
+
+
+def resolve_ranking(
+    session: Session,
+    hobby_id: int | None,
+    weights: str | None,
+    recency_half_life: float | None,
+) -> Ranking:
+    """Combine request overrides with the hobby's configured defaults."""
+    ranking = hobby_ranking(session, hobby_id)
+    if weights:
+        ranking.weights = parse_weights(weights)
+    if recency_half_life:
+        ranking.half_life_days = recency_half_life
+    return ranking
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import desc, func, select
+from sqlalchemy.orm import Session
+
+from ..models import Entry, EntryTag
 
 
 def normalize_tags(tags: str | Iterable[str] | None) -> list[str]:
@@ -31,3 +37,25 @@ def normalize_tags(tags: str | Iterable[str] | None) -> list[str]:
 def join_tags(tags: Iterable[str]) -> str:
     return ", ".join(tags)
 
+
+def tag_counts(
+    session: Session,
+    filters: list[Any],
+    prefix: str | None = None,
+    limit: int = 50,
+) -> list[tuple[str, int]]:
+    """Most used tags as ``(tag, count)``, optionally limited to a tag prefix.
+
+    Counts come from grouping ``entrytag`` on the ``(tag, entry_id)`` index;
+    the prefix is a range on that index rather than a ``LIKE`` scan, and
+    ``filters`` (from ``entry_filters``) restrict which entries are counted.
+    """
+    count = func.count().label("count")
+    stmt = select(EntryTag.tag, count).group_by(EntryTag.tag)
+    prefix = (prefix or "").strip().lower()
+    if prefix:
+        stmt = stmt.where(EntryTag.tag >= prefix, EntryTag.tag < prefix + "\U0010ffff")
+    if filters:
+        stmt = stmt.where(EntryTag.entry_id.in_(select(Entry.id).where(*filters)))
+    stmt = stmt.order_by(desc(count), EntryTag.tag).limit(limit)
+    return list(session.execute(stmt).tuples())
@@ -7,7 +7,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.auth import hash_password
-from app.db.fts import ensure_fts
+from app.db.closure import ensure_hobby_closure
+from app.db.fts import ensure_entry_summary, ensure_fts
 from app.db.session import get_session
 from app.main import app
 from app.models import Hobby, HobbyType, User
@@ -25,10 +26,12 @@ def test_db():
 
     Base.metadata.create_all(bind=engine)
 
-    # Setup FTS5 for testing
+    # Setup FTS5, entry summary and hobby closure triggers for testing
     session = TestingSessionLocal()
     try:
         ensure_fts(session)
+        ensure_entry_summary(session)
+        ensure_hobby_closure(session)
     finally:
         session.close()
 
@@ -1,8 +1,12 @@
 import io
+import json
+from datetime import UTC, datetime
 
 import pytest
+from sqlalchemy import event, text
 
-from app.models import Entry
+from app.db.fts import rebuild_entry_summary, run_fts_command
+from app.models import Entry, EntryMedia, EntryProp, EntrySummary
 
 
 @pytest.fixture
@@ -148,3 +152,568 @@ def test_entries_require_auth(client, test_entry):
 
     response = client.get(f"/api/entries/{test_entry.id}")
     assert response.status_code == 401
+
+
+def test_get_entries_query_count_constant(
+    auth_client, db_session, test_db, test_hobby, test_hobby_type
+):
+    """Test that list hydration does not issue per-row queries"""
+    for i in range(12):
+        entry = Entry(
+            hobby_id=test_hobby.id,
+            type_key=test_hobby_type.key,
+            title=f"Entry {i}",
+        )
+        db_session.add(entry)
+        db_session.flush()
+        db_session.add(
+            EntryMedia(entry_id=entry.id, kind="image", file_path=f"img/{i}.jpg")
+        )
+        db_session.add(EntryProp(entry_id=entry.id, key="test_prop", value_text=str(i)))
+    db_session.commit()
+
+    _, engine = test_db
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        counts = []
+        for limit in (2, 10):
+            statements.clear()
+            response = auth_client.get(f"/api/entries?limit={limit}")
+            assert response.status_code == 200
+            items = response.json()["items"]
+            assert len(items) == limit
+            assert all(item["media_count"] == 1 for item in items)
+            assert all(item["thumbnail_url"] for item in items)
+            assert all("test_prop" in item["props"] for item in items)
+            counts.append(len(statements))
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    assert counts[0] == counts[1]
+
+
+def test_get_entries_cursor_pagination(
+    auth_client, db_session, test_hobby, test_hobby_type
+):
+    """Test walking the entry list with next_cursor"""
+    for i in range(5):
+        db_session.add(Entry(
+            hobby_id=test_hobby.id, type_key=test_hobby_type.key, title=f"Paged {i}"
+        ))
+    db_session.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        url = "/api/entries?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        data = auth_client.get(url).json()
+        seen.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        assert data["has_more"] == (cursor is not None)
+        if not cursor:
+            break
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+def test_get_entries_invalid_cursor(auth_client):
+    """Test that a malformed cursor is rejected"""
+    response = auth_client.get("/api/entries?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+def test_get_entries_count_modes(auth_client, db_session, test_hobby, test_hobby_type):
+    """Test exact, estimate and none total count strategies"""
+    for i in range(3):
+        db_session.add(Entry(
+            hobby_id=test_hobby.id, type_key=test_hobby_type.key, title=f"Counted {i}"
+        ))
+    db_session.commit()
+
+    exact = auth_client.get("/api/entries?limit=2&count=exact").json()
+    assert exact["total"] == 3
+    assert exact["has_more"] is True
+
+    estimate = auth_client.get("/api/entries?limit=2&count=estimate").json()
+    assert estimate["total"] == 3
+    assert estimate["total_capped"] is False
+
+    none = auth_client.get("/api/entries?limit=2&count=none").json()
+    assert none["total"] is None
+    assert none["has_more"] is True
+
+    last = auth_client.get("/api/entries?limit=2&offset=2&count=none").json()
+    assert len(last["items"]) == 1
+    assert last["has_more"] is False
+
+    past_end = auth_client.get("/api/entries?limit=2&offset=10").json()
+    assert past_end["items"] == []
+    assert past_end["total"] == 3
+
+
+def test_entry_summary_maintained_by_triggers(auth_client, db_session, test_entry):
+    """Test that media and prop writes keep entry_summary current"""
+    db_session.add_all([
+        EntryMedia(entry_id=test_entry.id, kind="doc", file_path="docs/a.pdf"),
+        EntryMedia(entry_id=test_entry.id, kind="image", file_path="img/cover.jpg"),
+    ])
+    db_session.commit()
+    auth_client.post(f"/api/entries/{test_entry.id}/props", json={
+        "props": [{"key": "test_prop", "value_text": "first"}]
+    })
+
+    item = auth_client.get("/api/entries").json()["items"][0]
+    assert item["media_count"] == 2
+    assert item["thumbnail_url"].endswith("img/cover.jpg")
+    assert item["props"] == {"test_prop": "first"}
+
+    auth_client.delete(f"/api/entries/{test_entry.id}/props/test_prop")
+    item = auth_client.get("/api/entries").json()["items"][0]
+    assert item["props"] == {}
+
+    # A stale read model is repaired by the rebuild command's helper
+    db_session.query(EntrySummary).delete()
+    db_session.commit()
+    assert rebuild_entry_summary(db_session) == 1
+    db_session.commit()
+    item = auth_client.get("/api/entries").json()["items"][0]
+    assert item["media_count"] == 2
+
+
+def test_get_entries_sparse_fields(
+    auth_client, db_session, test_hobby, test_hobby_type
+):
+    """Test fields= projection and the precomputed excerpt"""
+    long_description = "Line one\n" + "word " * 60
+    db_session.add(Entry(
+        hobby_id=test_hobby.id, type_key=test_hobby_type.key,
+        title="Sparse", description=long_description,
+    ))
+    db_session.commit()
+
+    data = auth_client.get("/api/entries?fields=title,thumbnail_url").json()
+    assert data["items"] == [
+        {"id": data["items"][0]["id"], "title": "Sparse", "thumbnail_url": None}
+    ]
+    assert data["total"] == 1
+
+    item = auth_client.get("/api/entries?fields=excerpt").json()["items"][0]
+    assert set(item) == {"id", "excerpt"}
+    assert item["excerpt"].startswith("Line one word")
+    assert item["excerpt"].endswith("…")
+    assert len(item["excerpt"]) == 160 + len("…")
+
+    full = auth_client.get("/api/entries").json()["items"][0]
+    assert full["description"] == long_description
+    assert full["excerpt"] is None
+
+    response = auth_client.get("/api/entries?fields=title,secret")
+    assert response.status_code == 400
+
+
+def test_stream_entries_ndjson(
+    auth_client, db_session, test_hobby, test_hobby_type, monkeypatch
+):
+    """Test NDJSON streaming across batches with filters and fields"""
+    from app.routers import entries as entries_router
+
+    monkeypatch.setattr(entries_router, "STREAM_BATCH_SIZE", 2)
+    for i in range(5):
+        auth_client.post("/api/entries", json={
+            "hobby_id": test_hobby.id,
+            "type_key": test_hobby_type.key,
+            "title": f"Streamed {i}",
+            "tags": "even" if i % 2 == 0 else "odd",
+        })
+
+    response = auth_client.get("/api/entries/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    paged = auth_client.get("/api/entries?limit=100").json()["items"]
+    assert lines == paged
+
+    response = auth_client.get("/api/entries/stream?tag=even&fields=title")
+    lines = response.text.splitlines()
+    titles = [json.loads(line)["title"] for line in lines]
+    assert titles == ["Streamed 4", "Streamed 2", "Streamed 0"]
+    assert set(json.loads(lines[0])) == {"id", "title"}
+
+
+def test_create_entries_batch(auth_client, db_session, test_hobby, test_hobby_type):
+    """Test bulk creation of entries with tags and props"""
+    payload = {"entries": [
+        {
+            "hobby_id": test_hobby.id,
+            "type_key": test_hobby_type.key,
+            "title": f"Imported {i}",
+            "tags": "Import, batch" if i % 2 else None,
+            "props": [{"key": "test_prop", "value_text": f"value {i}"}],
+        }
+        for i in range(4)
+    ]}
+    response = auth_client.post("/api/entries/batch", json=payload)
+    assert response.status_code == 200
+    ids = response.json()["ids"]
+    assert len(ids) == 4
+
+    entry = auth_client.get(f"/api/entries/{ids[1]}").json()
+    assert entry["title"] == "Imported 1"
+    assert entry["tags"] == "import, batch"
+    assert entry["props"][0]["value_text"] == "value 1"
+
+    tagged = auth_client.get("/api/entries?tag=batch").json()
+    assert sorted(item["id"] for item in tagged["items"]) == [ids[1], ids[3]]
+    searched = auth_client.get("/api/search?q=value").json()
+    assert searched["total"] == 4
+    summary = db_session.get(EntrySummary, ids[2])
+    assert summary.props_json == '{"test_prop":"value 2"}'
+
+
+def test_create_entries_batch_is_atomic(auth_client, test_hobby, test_hobby_type):
+    """Test that one invalid entry rejects the whole batch"""
+    good = {"hobby_id": test_hobby.id, "type_key": test_hobby_type.key, "title": "Good"}
+    response = auth_client.post("/api/entries/batch", json={"entries": [
+        good,
+        {**good, "props": [{"key": "test_prop", "value_text": "42"}]},
+        {**good, "hobby_id": 999999},
+        {**good, "type_key": "missing"},
+    ]})
+    assert response.status_code == 400
+    detail = response.json()["message"]
+    assert "entries[1]" in detail
+    assert "entries[2]: Hobby 999999 not found" in detail
+    assert "entries[3]: Hobby type 'missing' not found" in detail
+    assert auth_client.get("/api/entries").json()["total"] == 0
+
+
+def test_bulk_edit_entries(auth_client, db_session, test_hobby, test_hobby_type):
+    """Test filter-driven bulk edits keep tag rows and entry.tags in step"""
+    good = {"hobby_id": test_hobby.id, "type_key": test_hobby_type.key}
+    ids = auth_client.post("/api/entries/batch", json={"entries": [
+        {**good, "title": f"Bulk {i}", "tags": "old, keep" if i < 3 else "keep",
+         "props": [{"key": "test_prop", "value_text": f"v{i}"}]}
+        for i in range(5)
+    ]}).json()["ids"]
+
+    def bulk(**body):
+        response = auth_client.post("/api/entries/bulk-edit", json=body)
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    assert bulk(filter={"tag": "old"}, operation="remove_tag", tag="old") == {
+        "matched": 3, "affected": 3,
+    }
+    assert auth_client.get("/api/entries?tag=old").json()["total"] == 0
+    assert auth_client.get(f"/api/entries/{ids[0]}").json()["tags"] == "keep"
+
+    result = bulk(filter={"q": "bulk"}, operation="add_tag", tag=" New ")
+    assert result == {"matched": 5, "affected": 5}
+    assert bulk(operation="add_tag", tag="new")["affected"] == 0
+    assert auth_client.get(f"/api/entries/{ids[4]}").json()["tags"] == "keep, new"
+    assert auth_client.get("/api/search?q=new").json()["total"] == 5
+
+    result = bulk(
+        filter={"type_key": test_hobby_type.key},
+        operation="delete_prop",
+        key="test_prop",
+    )
+    assert result == {"matched": 5, "affected": 5}
+    assert auth_client.get(f"/api/entries/{ids[1]}/props").json() == []
+
+    other = auth_client.post(
+        "/api/hobbies", json={"name": "Other Hobby", "color": "#000000"}
+    ).json()
+    result = bulk(
+        filter={"hobby_id": test_hobby.id}, operation="move_hobby", hobby_id=other["id"]
+    )
+    assert result == {"matched": 5, "affected": 5}
+    moved = auth_client.get(f"/api/entries?hobby_id={other['id']}").json()
+    assert moved["total"] == 5
+
+
+def test_bulk_edit_entries_validation(auth_client):
+    """Test that bulk edits reject incomplete operations"""
+    for body in [
+        {"operation": "move_hobby"},
+        {"operation": "move_hobby", "hobby_id": 999999},
+        {"operation": "add_tag", "tag": "a, b"},
+        {"operation": "delete_prop", "key": "test_prop"},
+    ]:
+        response = auth_client.post("/api/entries/bulk-edit", json=body)
+        assert response.status_code == 400
+
+
+def test_get_entries_multiple_tags(auth_client, test_hobby, test_hobby_type):
+    """Test filtering on several tags with match=all and match=any"""
+    base = {"hobby_id": test_hobby.id, "type_key": test_hobby_type.key}
+    ids = auth_client.post("/api/entries/batch", json={"entries": [
+        {**base, "title": "A", "tags": "film, portrait"},
+        {**base, "title": "B", "tags": "film, street"},
+        {**base, "title": "C", "tags": "digital, portrait"},
+        {**base, "title": "D", "tags": "film, portrait, street"},
+    ]}).json()["ids"]
+
+    def matching(query):
+        response = auth_client.get(f"/api/entries?{query}")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == len(data["items"])
+        return sorted(item["id"] for item in data["items"])
+
+    assert matching("tag=film&tag=portrait") == [ids[0], ids[3]]
+    assert matching("tag=Film,Portrait,street") == [ids[3]]
+    assert matching("tag=street&tag=digital&match=any") == [ids[1], ids[2], ids[3]]
+    assert matching("tag=film&tag=film") == [ids[0], ids[1], ids[3]]
+
+    searched = auth_client.get("/api/search?q=A OR D OR C&tag=portrait&tag=film").json()
+    assert sorted(item["id"] for item in searched["items"]) == [ids[0], ids[3]]
+
+
+def test_get_entries_typed_prop_filters_and_sort(auth_client, test_hobby):
+    """Test prop.<key>[op] filters and sort=prop.<key> on typed props"""
+    schema = {"type": "object", "properties": {
+        "bpm": {"type": "number"},
+        "live": {"type": "boolean"},
+        "genre": {"type": "string"},
+        "catalog": {"type": "string"},
+    }}
+    auth_client.post("/api/hobby-types", json={
+        "key": "track", "title": "Track", "schema_json": json.dumps(schema),
+    })
+    base = {"hobby_id": test_hobby.id, "type_key": "track"}
+
+    def props(**values):
+        return [{"key": k, "value_text": v} for k, v in values.items()]
+
+    ids = auth_client.post("/api/entries/batch", json={"entries": [
+        {**base, "title": "A", "props": props(
+            bpm="120", live="true", genre="house", catalog='"50"'
+        )},
+        {**base, "title": "B", "props": props(bpm="90.5", live="false", genre="dub")},
+        {**base, "title": "C", "props": props(bpm="140", genre="house")},
+        {**base, "title": "D", "props": props(genre="ambient")},
+    ]}).json()["ids"]
+
+    def listed(query):
+        response = auth_client.get(f"/api/entries?{query}")
+        assert response.status_code == 200, response.text
+        return [item["id"] for item in response.json()["items"]]
+
+    assert sorted(listed("prop.bpm[gte]=100")) == [ids[0], ids[2]]
+    assert listed("prop.bpm[gt]=90&prop.bpm[lt]=130&sort=prop.bpm") == [ids[1], ids[0]]
+    assert sorted(listed("prop.genre=house")) == [ids[0], ids[2]]
+    assert listed("prop.live=true") == [ids[0]]
+    # String props match whether or not the stored value is JSON-encoded
+    assert listed("prop.catalog=50") == [ids[0]]
+    assert listed("prop.catalog=%2250%22") == [ids[0]]
+    assert sorted(listed("prop.genre[ne]=house")) == [ids[1], ids[3]]
+    assert listed("prop.live[ne]=true") == [ids[1]]
+    assert listed("sort=prop.bpm") == [ids[1], ids[0], ids[2], ids[3]]
+    assert listed("sort=-prop.bpm") == [ids[2], ids[0], ids[1], ids[3]]
+
+    seen, cursor = [], None
+    while True:
+        page = auth_client.get(
+            "/api/entries?sort=-prop.bpm&limit=1"
+            + (f"&cursor={cursor}" if cursor else "")
+        ).json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == [ids[2], ids[0], ids[1], ids[3]]
+
+    for query in ("prop.bpm[gte]=fast", "prop.bpm[near]=1", "sort=bpm"):
+        assert auth_client.get(f"/api/entries?{query}").status_code == 400
+
+    # Retyping a prop in the schema reindexes existing values
+    schema["properties"]["bpm"] = {"type": ["string", "number"]}
+    schema["properties"]["live"] = {"type": "string"}
+    auth_client.patch(
+        "/api/hobby-types/track", json={"schema_json": json.dumps(schema)}
+    )
+    assert listed("prop.live=true") == [ids[0]]
+    assert sorted(listed("prop.bpm[gte]=100")) == [ids[0], ids[2]]
+
+
+def test_get_entries_created_range_and_histogram(
+    auth_client, db_session, test_hobby, test_hobby_type
+):
+    """Test created_from/created_to filters and day/week/month histograms"""
+    stamps = [
+        datetime(2026, 3, 1, 23, 30, tzinfo=UTC),  # Sunday
+        datetime(2026, 3, 2, 8, 0, tzinfo=UTC),  # Monday
+        datetime(2026, 3, 2, 18, 0, tzinfo=UTC),
+        datetime(2026, 3, 9, 12, 0, tzinfo=UTC),
+        datetime(2026, 4, 1, 0, 0, tzinfo=UTC),
+    ]
+    entries = [
+        Entry(
+            hobby_id=test_hobby.id, type_key=test_hobby_type.key,
+            title=f"E{i}", created_at=ts,
+        )
+        for i, ts in enumerate(stamps)
+    ]
+    db_session.add_all(entries)
+    db_session.commit()
+    ids = [e.id for e in entries]
+
+    def listed(query):
+        response = auth_client.get(f"/api/entries?{query}")
+        assert response.status_code == 200, response.text
+        return sorted(item["id"] for item in response.json()["items"])
+
+    assert listed("created_from=2026-03-02&created_to=2026-04-01") == ids[1:4]
+    assert listed("created_from=2026-04-01T00:00:00") == [ids[4]]
+    assert listed("created_to=2026-03-02T01:00:00%2B02:00") == []
+    assert listed("created_to=2026-03-02T02:00:00%2B02:00") == [ids[0]]
+
+    def histogram(query):
+        response = auth_client.get(f"/api/entries/histogram?{query}")
+        assert response.status_code == 200, response.text
+        return [(b["bucket"], b["count"]) for b in response.json()]
+
+    assert histogram("bucket=day") == [
+        ("2026-03-01", 1), ("2026-03-02", 2), ("2026-03-09", 1), ("2026-04-01", 1),
+    ]
+    assert histogram("bucket=week") == [
+        ("2026-02-23", 1), ("2026-03-02", 2), ("2026-03-09", 1), ("2026-03-30", 1),
+    ]
+    query = f"bucket=month&hobby_id={test_hobby.id}&created_from=2026-03-02"
+    assert histogram(query) == [
+        ("2026-03-01", 3), ("2026-04-01", 1),
+    ]
+    assert auth_client.get("/api/entries/histogram?bucket=year").status_code == 422
+
+    plan = db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM entry WHERE hobby_id = 1 "
+        "AND created_at >= '2026-03-02' AND created_at < '2026-04-01'"
+    )).all()
+    assert any("ix_entry_hobby_created" in row[-1] for row in plan)
+
+
+def test_entry_writes_are_diff_based(
+    auth_client, db_session, test_db, test_hobby, test_hobby_type
+):
+    """Test that tag and prop writes only touch rows that changed"""
+    _, engine = test_db
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = auth_client.post("/api/entries", json={
+            "hobby_id": test_hobby.id, "type_key": test_hobby_type.key,
+            "title": "Diff", "tags": "a, b",
+        })
+        assert response.status_code == 200
+        entry = response.json()
+        assert entry["tags"] == "a, b" and entry["created_at"]
+        assert sum(s.startswith("COMMIT") for s in statements) <= 1
+
+        def tag_rows():
+            return dict(db_session.execute(
+                text("SELECT tag, id FROM entrytag WHERE entry_id = :id"),
+                {"id": entry["id"]},
+            ).tuples().all())
+
+        before = tag_rows()
+        response = auth_client.patch(
+            f"/api/entries/{entry['id']}", json={"tags": "B, c"}
+        )
+        assert response.json()["tags"] == "b, c"
+        after = tag_rows()
+        assert set(after) == {"b", "c"} and after["b"] == before["b"]
+
+        url = f"/api/entries/{entry['id']}/props"
+        first = auth_client.post(url, json={"props": [
+            {"key": "test_prop", "value_text": "one"},
+            {"key": "other", "value_text": "x"},
+        ]}).json()
+        statements.clear()
+        second = auth_client.post(url, json={"props": [
+            {"key": "test_prop", "value_text": "one"},
+            {"key": "other", "value_text": "y"},
+        ]}).json()
+        assert [p["id"] for p in second] == [p["id"] for p in first]
+        assert second[1]["value_text"] == "y"
+        assert not any(s.startswith("DELETE FROM entryprop") for s in statements)
+
+        third = auth_client.post(url, json={"props": [
+            {"key": "test_prop", "value_text": "one"},
+        ]}).json()
+        assert [p["id"] for p in third] == [first[0]["id"]]
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert [p["key"] for p in auth_client.get(url).json()] == ["test_prop"]
+    # Upserts that update an existing prop leave the FTS index consistent
+    run_fts_command(db_session, "entry_fts", "integrity-check")
+    assert auth_client.get("/api/search?q=diff").json()["total"] == 1
+
+
+def test_get_entry_detail_eager_loaded(
+    auth_client, db_session, test_db, test_hobby, test_hobby_type
+):
+    """Test entry detail loads media, props and includes in constant queries"""
+    entry_ids = []
+    for n in (1, 5):
+        entry = Entry(
+            hobby_id=test_hobby.id,
+            type_key=test_hobby_type.key,
+            title=f"Entry with {n}",
+            tags="a, b",
+        )
+        db_session.add(entry)
+        db_session.flush()
+        for i in range(n):
+            db_session.add_all([
+                EntryMedia(entry_id=entry.id, kind="image", file_path=f"img/{i}.jpg"),
+                EntryProp(entry_id=entry.id, key=f"p{i}", value_text=f'"v{i}"'),
+            ])
+        entry_ids.append(entry.id)
+    db_session.commit()
+
+    _, engine = test_db
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        counts = []
+        for entry_id in entry_ids:
+            statements.clear()
+            response = auth_client.get(f"/api/entries/{entry_id}?include=hobby,type")
+            assert response.status_code == 200
+            counts.append(len(statements))
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+    assert counts[0] == counts[1]
+
+    data = response.json()
+    assert data["tags"] == "a, b"
+    assert len(data["media"]) == 5
+    assert all(m["file_path"].startswith("/api/uploads/") for m in data["media"])
+    assert {p["key"] for p in data["props"]} == {f"p{i}" for i in range(5)}
+    assert data["hobby"]["id"] == test_hobby.id
+    assert data["hobby"]["name"] == test_hobby.name
+    assert data["hobby_type"]["key"] == test_hobby_type.key
+
+    data = auth_client.get(f"/api/entries/{entry_ids[0]}").json()
+    assert data["hobby"] is None
+    assert data["hobby_type"] is None
+
+    response = auth_client.get(f"/api/entries/{entry_ids[0]}?include=owner")
+    assert response.status_code == 400
+    assert "owner" in response.json()["message"]
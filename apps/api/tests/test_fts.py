@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DatabaseError
+
+from app.db.fts import existing_fts_tables, fts_stats, run_fts_command
+from app.models import Entry
+
+
+def test_fts_optimize_merges_segments(db_session, test_hobby, test_hobby_type):
+    """Test that optimize merges trigger-written segments into one"""
+    for i in range(5):
+        db_session.add(Entry(
+            hobby_id=test_hobby.id, type_key=test_hobby_type.key, title=f"Segment {i}"
+        ))
+        db_session.commit()
+
+    for table in existing_fts_tables(db_session):
+        before = fts_stats(db_session, table)
+        assert before["rows"] == 5
+        assert before["segments"] >= 5
+        assert before["index_bytes"] > 0
+
+        run_fts_command(db_session, table, "optimize")
+        db_session.commit()
+        assert fts_stats(db_session, table)["segments"] == 1
+        run_fts_command(db_session, table, "integrity-check")
+
+
+def test_fts_integrity_check_and_rebuild(db_session, test_hobby, test_hobby_type):
+    """Test that integrity-check catches a stale index and rebuild repairs it"""
+    db_session.add(
+        Entry(hobby_id=test_hobby.id, type_key=test_hobby_type.key, title="Stale")
+    )
+    db_session.commit()
+    db_session.execute(text("DELETE FROM entry_fts_data WHERE id > 10"))
+    db_session.commit()
+
+    with pytest.raises(DatabaseError):
+        run_fts_command(db_session, "entry_fts", "integrity-check")
+    db_session.rollback()
+
+    run_fts_command(db_session, "entry_fts", "rebuild")
+    db_session.commit()
+    run_fts_command(db_session, "entry_fts", "integrity-check")
+
+    with pytest.raises(ValueError):
+        fts_stats(db_session, "entry")
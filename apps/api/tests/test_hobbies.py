@@ -0,0 +1,139 @@
+import pytest
+from sqlalchemy import event
+
+from app.models import Entry, HobbyClosure
+
+
+@pytest.fixture
+def auth_client(client, test_user):
+    """Authenticated client"""
+    client.post("/api/auth/login", json={"password": "testpass123"})
+    return client
+
+
+def closure_rows(db_session):
+    db_session.expire_all()
+    return {
+        (row.ancestor_id, row.descendant_id, row.depth)
+        for row in db_session.query(HobbyClosure).all()
+    }
+
+
+def test_closure_maintained_on_create_reparent_delete(auth_client, db_session):
+    """Test that hobby_closure follows create, reparent and delete"""
+    root = auth_client.post("/api/hobbies", json={"name": "Root"}).json()["id"]
+    child = auth_client.post(
+        "/api/hobbies", json={"name": "Child", "parent_id": root}
+    ).json()["id"]
+    leaf = auth_client.post(
+        "/api/hobbies", json={"name": "Leaf", "parent_id": child}
+    ).json()["id"]
+    other = auth_client.post("/api/hobbies", json={"name": "Other"}).json()["id"]
+
+    rows = closure_rows(db_session)
+    assert (root, leaf, 2) in rows
+    assert (child, leaf, 1) in rows
+    assert (leaf, leaf, 0) in rows
+
+    # Move the Child subtree under Other
+    response = auth_client.patch(f"/api/hobbies/{child}", json={"parent_id": other})
+    assert response.status_code == 200
+    rows = closure_rows(db_session)
+    assert (root, leaf, 2) not in rows
+    assert (root, child, 1) not in rows
+    assert (other, child, 1) in rows
+    assert (other, leaf, 2) in rows
+    assert (child, leaf, 1) in rows
+
+    response = auth_client.delete(f"/api/hobbies/{leaf}")
+    assert response.status_code == 200
+    rows = closure_rows(db_session)
+    assert not any(leaf in (a, d) for a, d, _ in rows)
+
+
+def test_reparent_under_descendant_rejected(auth_client):
+    """Test that a hobby cannot be moved into its own subtree"""
+    root = auth_client.post("/api/hobbies", json={"name": "Loop Root"}).json()["id"]
+    child = auth_client.post(
+        "/api/hobbies", json={"name": "Loop Child", "parent_id": root}
+    ).json()["id"]
+
+    response = auth_client.patch(f"/api/hobbies/{root}", json={"parent_id": child})
+    assert response.status_code == 400
+
+
+def test_entries_include_descendants(auth_client, db_session, test_hobby_type):
+    """Test subtree filtering through the closure table"""
+    root = auth_client.post("/api/hobbies", json={"name": "Tree Root"}).json()["id"]
+    child = auth_client.post(
+        "/api/hobbies", json={"name": "Tree Child", "parent_id": root}
+    ).json()["id"]
+    db_session.add(
+        Entry(hobby_id=child, type_key=test_hobby_type.key, title="Nested camera entry")
+    )
+    db_session.commit()
+
+    response = auth_client.get(f"/api/entries?hobby_id={root}&include_descendants=true")
+    titles = [item["title"] for item in response.json()["items"]]
+    assert titles == ["Nested camera entry"]
+
+    response = auth_client.get(f"/api/entries?hobby_id={root}")
+    assert response.json()["items"] == []
+
+    response = auth_client.get(f"/api/search?q=camera&hobby_id={root}")
+    titles = [item["title"] for item in response.json()["items"]]
+    assert titles == ["Nested camera entry"]
+
+
+def test_hobby_endpoints_load_tree_in_one_query(auth_client, test_db):
+    """Test nested hobby responses do not issue a query per node"""
+    root = auth_client.post("/api/hobbies", json={"name": "Deep Root"}).json()["id"]
+    parent = root
+    for i in range(4):
+        parent = auth_client.post(
+            "/api/hobbies", json={"name": f"Deep {i}", "parent_id": parent}
+        ).json()["id"]
+
+    _, engine = test_db
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        statements.clear()
+        hobby = auth_client.get(f"/api/hobbies/{root}").json()
+        full_count = len(statements)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    depth = 0
+    node = hobby
+    while node["children"]:
+        node = node["children"][0]
+        depth += 1
+    assert depth == 4
+    # Session lookups for auth aside, the tree is one query whatever its depth
+    assert full_count <= 3
+
+    hobby = auth_client.get(f"/api/hobbies/{root}?depth=1").json()
+    assert len(hobby["children"]) == 1
+    assert hobby["children"][0]["children"] == []
+    assert hobby["children"][0]["parent_id"] == root
+
+    roots = auth_client.get("/api/hobbies?depth=0").json()
+    assert root in [h["id"] for h in roots]
+    assert all(h["children"] == [] for h in roots)
+
+    children = auth_client.get(f"/api/hobbies/{root}/children?depth=0").json()
+    assert [h["name"] for h in children] == ["Deep 0"]
+    assert children[0]["children"] == []
+
+    tree = auth_client.get("/api/hobbies/tree?depth=2").json()
+    node = next(h for h in tree if h["id"] == root)
+    assert node["children"][0]["children"][0]["children"] == []
+
+    assert auth_client.get("/api/hobbies/999999").status_code == 404
+    assert auth_client.get("/api/hobbies?depth=-1").status_code == 422
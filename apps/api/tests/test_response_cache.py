@@ -0,0 +1,118 @@
+import pytest
+from sqlalchemy import text
+
+from app.models import Entry
+from app.services.response_cache import ResponseCache, response_cache
+
+
+@pytest.fixture
+def auth_client(client, test_user):
+    """Authenticated client"""
+    client.post("/api/auth/login", json={"password": "testpass123"})
+    return client
+
+
+@pytest.fixture
+def test_entry(db_session, test_hobby, test_hobby_type):
+    """Create a test entry"""
+    entry = Entry(
+        hobby_id=test_hobby.id,
+        type_key=test_hobby_type.key,
+        title="Cached Entry",
+    )
+    db_session.add(entry)
+    db_session.commit()
+    db_session.refresh(entry)
+    return entry
+
+
+def test_cache_lru_and_ttl():
+    """Test size and TTL bounds of the cache"""
+    cache = ResponseCache(max_size=2, ttl=60)
+    cache.set(("a",), 1)
+    cache.set(("b",), 2)
+    assert cache.get(("a",)) == 1
+    cache.set(("c",), 3)
+    # "b" was least recently used
+    assert cache.get(("b",)) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    expired = ResponseCache(max_size=2, ttl=-1)
+    expired.set(("a",), 1)
+    assert expired.get(("a",)) is None
+
+
+def test_entries_cached_until_write(auth_client, db_session, test_entry):
+    """Test that list responses are served from cache until a committed write"""
+    response_cache.clear()
+    first = auth_client.get("/api/entries?limit=5").json()
+    auth_client.get("/api/entries?limit=5")
+    assert response_cache.stats()["hits"] == 1
+
+    db_session.add(Entry(
+        hobby_id=test_entry.hobby_id, type_key=test_entry.type_key, title="Fresh"
+    ))
+    db_session.commit()
+    second = auth_client.get("/api/entries?limit=5").json()
+    assert second["total"] == first["total"] + 1
+
+    # Raw SQL writes invalidate as well
+    db_session.execute(
+        text("UPDATE entry SET title = 'Renamed' WHERE id = :id"), {"id": test_entry.id}
+    )
+    db_session.commit()
+    third = auth_client.get("/api/entries?limit=5").json()
+    assert "Renamed" in [item["title"] for item in third["items"]]
+
+
+def test_uncommitted_write_keeps_cache(auth_client, db_session, test_entry):
+    """Test that a rolled back write does not invalidate"""
+    response_cache.clear()
+    auth_client.get("/api/entries")
+    db_session.add(Entry(
+        hobby_id=test_entry.hobby_id, type_key=test_entry.type_key, title="Discarded"
+    ))
+    db_session.flush()
+    db_session.rollback()
+    auth_client.get("/api/entries")
+    assert response_cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("path", [
+    "/api/entries",
+    "/api/entries?fields=title",
+    "/api/search?q=cached",
+    "/api/hobbies/tree",
+    "/api/hobby-types",
+    "/api/entries/{id}",
+])
+def test_conditional_get_returns_304(auth_client, test_entry, path):
+    """Test ETag revalidation on read endpoints"""
+    url = path.format(id=test_entry.id)
+    first = auth_client.get(url)
+    etag = first.headers["etag"]
+    assert etag.startswith('"')
+
+    again = auth_client.get(url, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+    other = auth_client.get(url, headers={"If-None-Match": '"stale"'})
+    assert other.status_code == 200
+    assert other.headers["etag"] == etag
+
+
+def test_etag_changes_after_write(auth_client, test_entry):
+    """Test that a committed write changes the ETag"""
+    url = f"/api/entries/{test_entry.id}"
+    etag = auth_client.get(url).headers["etag"]
+
+    auth_client.post(f"/api/entries/{test_entry.id}/props", json={
+        "props": [{"key": "test_prop", "value_text": "new"}]
+    })
+    response = auth_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["props"][0]["value_text"] == "new"
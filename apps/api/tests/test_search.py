@@ -1,3 +1,5 @@
+from datetime import UTC, datetime
+
 import pytest
 
 from app.models import Entry
@@ -108,3 +110,250 @@ def test_search_requires_auth(client):
     """Test that search requires authentication"""
     response = client.get("/api/search?q=test")
     assert response.status_code == 401
+
+
+def test_search_cursor_pagination(auth_client, searchable_entries):
+    """Test walking search results with next_cursor"""
+    first = auth_client.get("/api/search?q=camera&limit=1").json()
+    assert first["has_more"] is True
+    assert first["next_cursor"]
+
+    second = auth_client.get(
+        f"/api/search?q=camera&limit=1&cursor={first['next_cursor']}"
+    ).json()
+    assert len(second["items"]) == 1
+    assert second["items"][0]["id"] != first["items"][0]["id"]
+    assert second["next_cursor"] is None
+
+
+def test_search_count_none(auth_client, searchable_entries):
+    """Test that search can skip the total count"""
+    response = auth_client.get("/api/search?q=camera&limit=1&count=none")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] is None
+    assert data["has_more"] is True
+
+
+def test_search_prop_values(auth_client, searchable_entries):
+    """Test that prop values are searchable and follow prop changes"""
+    entry = searchable_entries[1]
+    auth_client.post(f"/api/entries/{entry.id}/props", json={
+        "props": [{"key": "test_prop", "value_text": "Hasselblad"}]
+    })
+
+    data = auth_client.get("/api/search?q=hasselblad").json()
+    assert [item["id"] for item in data["items"]] == [entry.id]
+
+    auth_client.post(f"/api/entries/{entry.id}/props", json={
+        "props": [{"key": "test_prop", "value_text": "Leica"}]
+    })
+    assert auth_client.get("/api/search?q=hasselblad").json()["items"] == []
+    assert len(auth_client.get("/api/search?q=leica").json()["items"]) == 1
+
+
+def test_search_suggest(auth_client, searchable_entries):
+    """Test prefix completions for terms and titles"""
+    response = auth_client.get("/api/search/suggest?q=cam")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["terms"][0] == {"term": "camera", "count": 2}
+    assert {t["title"] for t in data["titles"]} == {"Camera Review"}
+
+    data = auth_client.get("/api/search/suggest?q=cooking rec").json()
+    assert [t["title"] for t in data["titles"]] == ["Cooking Recipe"]
+
+    data = auth_client.get("/api/search/suggest?q=;").json()
+    assert data == {"terms": [], "titles": []}
+
+
+def test_search_facets(auth_client, test_hobby, test_hobby_type):
+    """Test grouped hobby, type and tag counts over the matched set"""
+    for title, tags in [
+        ("Lens cleaning", "camera,care"),
+        ("Lens review", "camera,review"),
+        ("Knife care", "care"),
+    ]:
+        auth_client.post("/api/entries", json={
+            "hobby_id": test_hobby.id,
+            "type_key": test_hobby_type.key,
+            "title": title,
+            "tags": tags,
+        })
+
+    data = auth_client.get("/api/search?q=lens&limit=1&facets=true").json()
+    assert data["facets"] == {
+        "hobby_id": [{"value": test_hobby.id, "count": 2}],
+        "type_key": [{"value": test_hobby_type.key, "count": 2}],
+        "tag": [
+            {"value": "camera", "count": 2},
+            {"value": "care", "count": 1},
+            {"value": "review", "count": 1},
+        ],
+    }
+
+    data = auth_client.get("/api/entries?tag=care&facets=true").json()
+    assert data["facets"]["tag"][0] == {"value": "care", "count": 2}
+
+    assert auth_client.get("/api/search?q=lens").json()["facets"] is None
+
+
+def test_search_highlight(auth_client, searchable_entries):
+    """Test highlighted titles and description excerpts"""
+    data = auth_client.get("/api/search?q=review&highlight=true").json()
+    item = data["items"][0]
+    assert item["title"] == "Camera <mark>Review</mark>"
+    assert item["excerpt"] == "<mark>Review</mark> of the new camera model"
+    assert item["description"] is None
+
+    data = auth_client.get(
+        "/api/search?q=camera&highlight=true&highlight_start=[&highlight_end=]"
+        "&snippet_tokens=2"
+    ).json()
+    excerpts = {item["title"]: item["excerpt"] for item in data["items"]}
+    assert excerpts["[Camera] Review"].endswith("[camera] model")
+    assert excerpts["Photography Tips"] == "…[camera] settings"
+
+    plain = auth_client.get("/api/search?q=review").json()["items"][0]
+    assert plain["excerpt"] is None
+    assert plain["description"] == "Review of the new camera model"
+
+
+def test_search_column_weights(auth_client, db_session, test_hobby, test_hobby_type):
+    """Test per-column BM25 weights from the request and the hobby config"""
+    in_title = Entry(
+        hobby_id=test_hobby.id, type_key=test_hobby_type.key,
+        title="Tripod", description="Carbon legs",
+    )
+    in_description = Entry(
+        hobby_id=test_hobby.id, type_key=test_hobby_type.key,
+        title="Ballhead", description="Fits any tripod, tripod plate included",
+    )
+    db_session.add_all([in_title, in_description])
+    db_session.commit()
+
+    def ids(url):
+        return [item["id"] for item in auth_client.get(url).json()["items"]]
+
+    assert ids("/api/search?q=tripod&weights=title:0.1")[0] == in_description.id
+    assert ids("/api/search?q=tripod&weights=title:20")[0] == in_title.id
+
+    test_hobby.config_json = '{"search": {"weights": {"description": 0.1}}}'
+    db_session.commit()
+    url = f"/api/search?q=tripod&hobby_id={test_hobby.id}"
+    assert ids(url)[0] == in_title.id
+    assert ids(url + "&weights=title:0.1")[0] == in_description.id
+
+    assert auth_client.get("/api/search?q=tripod&weights=price:2").status_code == 400
+    assert auth_client.get("/api/search?q=tripod&weights=title").status_code == 400
+
+
+def test_search_recency_boost(auth_client, db_session, test_hobby, test_hobby_type):
+    """Test that a recency half-life lets newer hits outrank older better matches"""
+    old = Entry(
+        hobby_id=test_hobby.id, type_key=test_hobby_type.key,
+        title="Sourdough sourdough", created_at=datetime(2020, 1, 1, tzinfo=UTC),
+    )
+    new = Entry(hobby_id=test_hobby.id, type_key=test_hobby_type.key, title="Sourdough")
+    db_session.add_all([old, new])
+    db_session.commit()
+
+    def ids(url):
+        return [item["id"] for item in auth_client.get(url).json()["items"]]
+
+    assert ids("/api/search?q=sourdough") == [old.id, new.id]
+    assert ids("/api/search?q=sourdough&recency_half_life=30") == [new.id, old.id]
+
+
+def test_search_recency_cursor_pages(
+    auth_client, db_session, test_hobby, test_hobby_type, monkeypatch
+):
+    """Test that recency-ranked cursor pages keep the first page's clock"""
+    from app.routers import search as search_router
+
+    entries = [
+        Entry(
+            hobby_id=test_hobby.id, type_key=test_hobby_type.key,
+            title=" ".join(["kiln"] * (1 + i % 4)),
+            created_at=datetime(2026, 1, 1 + i, tzinfo=UTC),
+        )
+        for i in range(30)
+    ]
+    db_session.add_all(entries)
+    db_session.commit()
+
+    # Each uncached ranking would see a clock 50 days later than the last
+    clock = [2461000.5]
+
+    def advancing_now():
+        clock[0] += 50
+        return clock[0]
+
+    monkeypatch.setattr(search_router, "julian_day_now", advancing_now)
+    url = "/api/search?q=kiln&recency_half_life=7&count=none&limit="
+    seen, cursor = [], None
+    while True:
+        page = auth_client.get(
+            url + "4" + (f"&cursor={cursor}" if cursor else "")
+        ).json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 30
+
+    clock[0] = 2461000.5
+    assert [item["id"] for item in auth_client.get(url + "100").json()["items"]] == seen
+
+
+def test_search_substring_mode(auth_client, test_hobby, test_hobby_type):
+    """Test trigram substring search over fragments the tokenizer splits"""
+    lens = auth_client.post("/api/entries", json={
+        "hobby_id": test_hobby.id,
+        "type_key": test_hobby_type.key,
+        "title": "Nikkor 70-200mm f/2.8",
+        "description": "Bought from example.com/shop",
+    }).json()
+    book = auth_client.post("/api/entries", json={
+        "hobby_id": test_hobby.id,
+        "type_key": test_hobby_type.key,
+        "title": "C Programming",
+        "description": "ISBN 978-0-13-110362-7",
+    }).json()
+
+    def ids(q, **params):
+        params = {"q": q, "mode": "substring", **params}
+        data = auth_client.get("/api/search", params=params).json()
+        return [item["id"] for item in data["items"]]
+
+    assert ids("70-200") == [lens["id"]]
+    assert ids("978-0") == [book["id"]]
+    assert ids("PLE.COM/sh") == [lens["id"]]
+    assert ids("0-2.8") == []
+
+    item = auth_client.get("/api/search", params={
+        "q": "70-200", "mode": "substring", "highlight": "true",
+    }).json()["items"][0]
+    assert item["title"] == "Nikkor <mark>70-200</mark>mm f/2.8"
+
+    auth_client.patch(f"/api/entries/{lens['id']}", json={"title": "Nikkor 24-70mm"})
+    assert ids("70-200") == []
+    assert ids("24-70") == [lens["id"]]
+
+    auth_client.delete(f"/api/entries/{book['id']}")
+    assert ids("978-0") == []
+
+    response = auth_client.get("/api/search", params={"q": "70", "mode": "substring"})
+    assert response.status_code == 400
+
+
+def test_search_sparse_fields(auth_client, searchable_entries):
+    """Test fields= projection on search, with and without highlighting"""
+    data = auth_client.get("/api/search?q=review&fields=title").json()
+    assert data["items"] == [{"id": searchable_entries[2].id, "title": "Camera Review"}]
+
+    data = auth_client.get("/api/search?q=review&fields=id&highlight=true").json()
+    assert data["items"] == [{
+        "id": searchable_entries[2].id,
+        "excerpt": "<mark>Review</mark> of the new camera model",
+    }]
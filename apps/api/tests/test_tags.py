@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import text
+
+
+@pytest.fixture
+def auth_client(client, test_user):
+    """Authenticated client"""
+    client.post("/api/auth/login", json={"password": "testpass123"})
+    return client
+
+
+def test_get_tags_counts(auth_client, test_hobby, test_hobby_type):
+    """Test tag counts, prefix filter and hobby scope"""
+    other = auth_client.post("/api/hobbies", json={"name": "Other"}).json()["id"]
+    base = {"hobby_id": test_hobby.id, "type_key": test_hobby_type.key}
+    auth_client.post("/api/entries/batch", json={"entries": [
+        {**base, "title": "A", "tags": "Film, portrait"},
+        {**base, "title": "B", "tags": "film, street"},
+        {**base, "title": "C", "tags": "film"},
+        {**base, "hobby_id": other, "title": "D", "tags": "portrait, fiction"},
+    ]})
+
+    response = auth_client.get("/api/tags")
+    assert response.status_code == 200
+    assert response.json() == [
+        {"tag": "film", "count": 3},
+        {"tag": "portrait", "count": 2},
+        {"tag": "fiction", "count": 1},
+        {"tag": "street", "count": 1},
+    ]
+
+    top = auth_client.get("/api/tags?limit=2").json()
+    assert [t["tag"] for t in top] == ["film", "portrait"]
+
+    prefixed = auth_client.get("/api/tags?prefix=F").json()
+    assert [t["tag"] for t in prefixed] == ["film", "fiction"]
+
+    scoped = auth_client.get(f"/api/tags?hobby_id={other}").json()
+    assert scoped == [{"tag": "fiction", "count": 1}, {"tag": "portrait", "count": 1}]
+
+
+def test_get_tags_uses_composite_index(db_session):
+    """Test that tag grouping is served from the (tag, entry_id) index"""
+    plan = db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT tag, count(*) FROM entrytag "
+        "WHERE tag >= 'f' AND tag < 'g' GROUP BY tag"
+    )).all()
+    assert any("ix_entrytag_tag_entry" in row[-1] for row in plan)
+
+
+def test_get_tags_requires_auth(client):
+    """Test that tags require authentication"""
+    assert client.get("/api/tags").status_code == 401
+
+
+def test_get_tags_follow_hobby_reparent(auth_client, test_hobby_type):
+    """Test that cached subtree tag counts are invalidated by a reparent"""
+    root = auth_client.post("/api/hobbies", json={"name": "Tag Root"}).json()["id"]
+    moved = auth_client.post("/api/hobbies", json={"name": "Tag Moved"}).json()["id"]
+    auth_client.post("/api/entries", json={
+        "hobby_id": moved, "type_key": test_hobby_type.key,
+        "title": "Moved", "tags": "analog",
+    })
+
+    url = f"/api/tags?hobby_id={root}&include_descendants=true"
+    response = auth_client.get(url)
+    assert response.json() == []
+    etag = response.headers["etag"]
+
+    response = auth_client.patch(f"/api/hobbies/{moved}", json={"parent_id": root})
+    assert response.status_code == 200
+
+    response = auth_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json() == [{"tag": "analog", "count": 1}]
@@ -2,9 +2,11 @@ import {
   User, UserUpdate, LoginRequest,
   Hobby, HobbyCreate, HobbyUpdate,
   HobbyType, HobbyTypeCreate, HobbyTypeUpdate,
-  Entry, EntryCreate, EntryUpdate, EntryListItem,
+  Entry, EntryCreate, EntryDetail, EntryUpdate, EntryListItem,
+  EntryBatchItem, EntryBatchResult, EntryBulkEdit, EntryBulkEditResult,
+  EntryHistogramBucket,
   EntryProp, EntryPropBase, EntryMedia,
-  PaginatedResponse, SearchRequest
+  PaginatedResponse, SearchRequest, SuggestResponse, TagCount
 } from './types';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || '/api';
@@ -97,17 +99,27 @@ export const usersAPI = {
 
 // Hobbies API
 export const hobbiesAPI = {
-  async getHobbies(parentId?: number): Promise<Hobby[]> {
-    const params = parentId !== undefined ? `?parent_id=${parentId}` : '';
-    return request(`/hobbies${params}`);
+  async getHobbies(parentId?: number, depth?: number): Promise<Hobby[]> {
+    const searchParams = new URLSearchParams();
+    if (parentId !== undefined) searchParams.append('parent_id', String(parentId));
+    if (depth !== undefined) searchParams.append('depth', String(depth));
+    const query = searchParams.toString();
+    return request(`/hobbies${query ? `?${query}` : ''}`);
+  },
+
+  async getHobbiesTree(depth?: number): Promise<Hobby[]> {
+    const params = depth !== undefined ? `?depth=${depth}` : '';
+    return request(`/hobbies/tree${params}`);
   },
 
-  async getHobbiesTree(): Promise<Hobby[]> {
-    return request('/hobbies/tree');
+  async getHobby(id: number, depth?: number): Promise<Hobby> {
+    const params = depth !== undefined ? `?depth=${depth}` : '';
+    return request(`/hobbies/${id}${params}`);
   },
 
-  async getHobby(id: number): Promise<Hobby> {
-    return request(`/hobbies/${id}`);
+  async getHobbyChildren(id: number, depth?: number): Promise<Hobby[]> {
+    const params = depth !== undefined ? `?depth=${depth}` : '';
+    return request(`/hobbies/${id}/children${params}`);
   },
 
   async createHobby(data: HobbyCreate): Promise<Hobby> {
@@ -164,9 +176,20 @@ export const entriesAPI = {
     q?: string;
     hobby_id?: number;
     type_key?: string;
-    tag?: string;
+    tag?: string | string[];
+    match?: 'all' | 'any';
+    created_from?: string;
+    created_to?: string;
     limit?: number;
     offset?: number;
+    cursor?: string;
+    count?: 'exact' | 'estimate' | 'none';
+    facets?: boolean;
+    fields?: string;
+    weights?: string;
+    recency_half_life?: number;
+    sort?: string;
+    [propFilter: `prop.${string}`]: string | number | boolean | undefined;
   }): Promise<PaginatedResponse<EntryListItem>> {
     const searchParams = new URLSearchParams();
     if (params) {
@@ -180,8 +203,80 @@ export const entriesAPI = {
     return request(`/entries${query ? `?${query}` : ''}`);
   },
 
-  async getEntry(id: number): Promise<Entry> {
-    return request(`/entries/${id}`);
+  async getEntriesHistogram(params?: {
+    bucket?: 'day' | 'week' | 'month';
+    q?: string;
+    hobby_id?: number;
+    type_key?: string;
+    tag?: string | string[];
+    match?: 'all' | 'any';
+    created_from?: string;
+    created_to?: string;
+    include_descendants?: boolean;
+    [propFilter: `prop.${string}`]: string | number | boolean | undefined;
+  }): Promise<EntryHistogramBucket[]> {
+    const searchParams = new URLSearchParams();
+    if (params) {
+      Object.entries(params).forEach(([key, value]) => {
+        if (value !== undefined) {
+          searchParams.append(key, value.toString());
+        }
+      });
+    }
+    const query = searchParams.toString();
+    return request(`/entries/histogram${query ? `?${query}` : ''}`);
+  },
+
+  async *streamEntries(params?: {
+    q?: string;
+    hobby_id?: number;
+    type_key?: string;
+    tag?: string | string[];
+    match?: 'all' | 'any';
+    created_from?: string;
+    created_to?: string;
+    include_descendants?: boolean;
+    fields?: string;
+    sort?: string;
+    [propFilter: `prop.${string}`]: string | number | boolean | undefined;
+  }): AsyncGenerator<EntryListItem> {
+    const searchParams = new URLSearchParams();
+    if (params) {
+      Object.entries(params).forEach(([key, value]) => {
+        if (value !== undefined) {
+          searchParams.append(key, value.toString());
+        }
+      });
+    }
+    const query = searchParams.toString();
+    const response = await fetch(
+      `${API_BASE_URL}/entries/stream${query ? `?${query}` : ''}`,
+      { credentials: 'include' }
+    );
+    if (!response.ok || !response.body) {
+      throw new APIError(response.status, 'UNKNOWN_ERROR', `HTTP ${response.status}`);
+    }
+
+    // One JSON document per line; a chunk may end mid-line
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+      const { done, value } = await reader.read();
+      buffer += decoder.decode(value, { stream: !done });
+      const lines = buffer.split('\n');
+      buffer = lines.pop() ?? '';
+      for (const line of lines) {
+        if (line) yield JSON.parse(line);
+      }
+      if (done) break;
+    }
+    if (buffer) yield JSON.parse(buffer);
+  },
+
+  async getEntry(id: number, include?: Array<'hobby' | 'type'>): Promise<EntryDetail> {
+    const query = include?.length ? `?include=${include.join(',')}` : '';
+    return request(`/entries/${id}${query}`);
   },
 
   async createEntry(data: EntryCreate): Promise<Entry> {
@@ -191,6 +286,20 @@ export const entriesAPI = {
     });
   },
 
+  async createEntriesBatch(entries: EntryBatchItem[]): Promise<EntryBatchResult> {
+    return request('/entries/batch', {
+      method: 'POST',
+      body: JSON.stringify({ entries }),
+    });
+  },
+
+  async bulkEditEntries(edit: EntryBulkEdit): Promise<EntryBulkEditResult> {
+    return request('/entries/bulk-edit', {
+      method: 'POST',
+      body: JSON.stringify(edit),
+    });
+  },
+
   async updateEntry(id: number, data: EntryUpdate): Promise<Entry> {
     return request(`/entries/${id}`, {
       method: 'PATCH',
@@ -251,8 +360,19 @@ export const entriesAPI = {
 // Search API
 export const searchAPI = {
   async search(params: SearchRequest & {
+    mode?: 'fts' | 'substring';
     limit?: number;
     offset?: number;
+    cursor?: string;
+    count?: 'exact' | 'estimate' | 'none';
+    facets?: boolean;
+    fields?: string;
+    weights?: string;
+    recency_half_life?: number;
+    highlight?: boolean;
+    highlight_start?: string;
+    highlight_end?: string;
+    snippet_tokens?: number;
   }): Promise<PaginatedResponse<EntryListItem>> {
     const searchParams = new URLSearchParams();
     Object.entries(params).forEach(([key, value]) => {
@@ -262,4 +382,34 @@ export const searchAPI = {
     });
     return request(`/search?${searchParams.toString()}`);
   },
+
+  async suggest(q: string, limit?: number): Promise<SuggestResponse> {
+    const searchParams = new URLSearchParams({ q });
+    if (limit !== undefined) {
+      searchParams.append('limit', limit.toString());
+    }
+    return request(`/search/suggest?${searchParams.toString()}`);
+  },
+};
+
+// Tags API
+export const tagsAPI = {
+  async getTags(params?: {
+    prefix?: string;
+    hobby_id?: number;
+    type_key?: string;
+    include_descendants?: boolean;
+    limit?: number;
+  }): Promise<TagCount[]> {
+    const searchParams = new URLSearchParams();
+    if (params) {
+      Object.entries(params).forEach(([key, value]) => {
+        if (value !== undefined) {
+          searchParams.append(key, value.toString());
+        }
+      });
+    }
+    const query = searchParams.toString();
+    return request(`/tags${query ? `?${query}` : ''}`);
+  },
 };
\ No newline at end of file
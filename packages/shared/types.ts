@@ -97,6 +97,20 @@ export interface Entry {
   props: EntryProp[];
 }
 
+export interface HobbySummary {
+  id: number;
+  name: string;
+  color?: string;
+  icon?: string;
+  parent_id?: number;
+  slug?: string;
+}
+
+export interface EntryDetail extends Entry {
+  hobby?: HobbySummary | null;
+  hobby_type?: HobbyType | null;
+}
+
 export interface EntryListItem {
   id: number;
   hobby_id: number;
@@ -109,6 +123,7 @@ export interface EntryListItem {
   media_count: number;
   thumbnail_url?: string;
   props: Record<string, any>;
+  excerpt?: string | null;
 }
 
 export interface EntryCreate {
@@ -119,6 +134,43 @@ export interface EntryCreate {
   tags?: string;
 }
 
+export interface EntryBatchItem extends EntryCreate {
+  props?: EntryPropBase[];
+}
+
+export interface EntryBatchResult {
+  ids: number[];
+}
+
+export interface EntryBulkFilter {
+  q?: string;
+  hobby_id?: number;
+  type_key?: string;
+  tag?: string | string[];
+  match?: 'all' | 'any';
+  include_descendants?: boolean;
+  created_from?: string;
+  created_to?: string;
+}
+
+export interface EntryBulkEdit {
+  filter?: EntryBulkFilter;
+  operation: 'move_hobby' | 'add_tag' | 'remove_tag' | 'delete_prop';
+  hobby_id?: number;
+  tag?: string;
+  key?: string;
+}
+
+export interface EntryHistogramBucket {
+  bucket: string;
+  count: number;
+}
+
+export interface EntryBulkEditResult {
+  matched: number;
+  affected: number;
+}
+
 export interface EntryUpdate {
   title?: string;
   description?: string;
@@ -126,12 +178,25 @@ export interface EntryUpdate {
 }
 
 // Common types
+export interface TagCount {
+  tag: string;
+  count: number;
+}
+
+export interface FacetCount {
+  value: number | string;
+  count: number;
+}
+
 export interface PaginatedResponse<T> {
   items: T[];
-  total: number;
+  total: number | null;
   limit: number;
   offset: number;
   has_more: boolean;
+  next_cursor?: string | null;
+  total_capped?: boolean;
+  facets?: Record<'hobby_id' | 'type_key' | 'tag', FacetCount[]> | null;
 }
 
 export interface ErrorResponse {
@@ -146,10 +211,18 @@ export interface SearchRequest {
   q: string;
   hobby_id?: number;
   type_key?: string;
-  tag?: string;
+  tag?: string | string[];
+  match?: 'all' | 'any';
+  created_from?: string;
+  created_to?: string;
 }
 
 export interface SearchResult {
   entry: EntryListItem;
   rank: number;
+}
+
+export interface SuggestResponse {
+  terms: { term: string; count: number }[];
+  titles: { id: number; title: string }[];
 }
\ No newline at end of file